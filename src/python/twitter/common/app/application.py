@@ -21,7 +21,7 @@ try:
 except ImportError:
   import configparser as ConfigParser
 
-from collections import defaultdict, deque
+from collections import deque
 import copy
 from functools import partial, wraps
 import inspect
@@ -151,7 +151,10 @@ class Application(object):
     self._force_args = force_args
     self._registered_modules = []
     self._init_modules = []
-    self._option_targets = defaultdict(dict)
+    self._module_registry = {}
+    self._rc_cache = None
+    self._option_targets = {}
+    self._configured_modules = set()
     self._global_options = {}
     self._interspersed_args = False
     self._main_options = self.HELP_OPTIONS[:]
@@ -195,8 +198,9 @@ class Application(object):
     self._interspersed_args = bool(value)
 
   def _configure_options(self, module, option_dict):
+    self._configured_modules.add(module)
     for opt_name, opt in option_dict.items():
-      self._option_targets[module][opt_name] = opt.dest
+      self._option_targets[(module, opt_name)] = opt.dest
 
   @pre_initialization
   def configure(self, module=None, **kw):
@@ -221,15 +225,14 @@ class Application(object):
       these options, just pass along the module name:
         app.configure(module='twitter.common.app.modules.http', enable=True)
     """
-    if module not in self._option_targets:
+    if module not in self._configured_modules:
       if not self._import_module(module):
         raise self.Error('Unknown module to configure: %s' % module)
-    def configure_option(name, value):
-      if name not in self._option_targets[module]:
-        raise self.Error('Module %s has no option %s' % (module, name))
-      self.set_option(self._option_targets[module][name], value)
     for option_name, option_value in kw.items():
-      configure_option(option_name, option_value)
+      target = (module, option_name)
+      if target not in self._option_targets:
+        raise self.Error('Module %s has no option %s' % (module, option_name))
+      self.set_option(self._option_targets[target], option_value)
 
   def _main_parser(self):
     return (options.parser().interspersed_arguments(self._interspersed_args)
@@ -284,16 +287,31 @@ class Application(object):
 
     if self.IGNORE_RC_FLAG not in argv and os.path.exists(rc_filename):
       command = self._command or self.NO_COMMAND
-      rc_config = ConfigParser.SafeConfigParser()
-      rc_config.read(rc_filename)
-
-      if rc_config.has_option(command, self.OPTIONS):
-        default_options_str = rc_config.get(command, self.OPTIONS)
-        default_options = shlex.split(default_options_str, True)
+      default_options = self._rc_file_options(rc_filename, command)
+      if default_options:
         options = default_options + options
 
     return options
 
+  def _rc_file_options(self, rc_filename, command):
+    """
+      Return the default option tokens for command from the rc file, or None.  The parsed
+      file is cached until its modification time changes, and each command's options line is
+      tokenized on first use, so that a malformed line only affects its own command.
+    """
+    cache_key = (rc_filename, os.path.getmtime(rc_filename))
+    if self._rc_cache is None or self._rc_cache[0] != cache_key:
+      rc_config = ConfigParser.SafeConfigParser()
+      rc_config.read(rc_filename)
+      self._rc_cache = (cache_key, rc_config, {})
+    _, rc_config, command_options = self._rc_cache
+    if command not in command_options:
+      if rc_config.has_option(command, self.OPTIONS):
+        command_options[command] = shlex.split(rc_config.get(command, self.OPTIONS), True)
+      else:
+        command_options[command] = None
+    return command_options[command]
+
   def _parse_options(self, force_args=None):
     """
       Parse options and set self.option_values and self.argv to the values to be passed into
@@ -322,8 +340,9 @@ class Application(object):
     """
       Setup all initialized modules.
     """
-    module_registry = AppModule.module_registry()
-    for bundle in topological_sort(AppModule.module_dependencies()):
+    module_registry = self._module_registry = AppModule.module_registry()
+    module_dependencies = AppModule.module_dependencies()
+    for bundle in topological_sort(module_dependencies):
       for module_label in bundle:
         assert module_label in module_registry
         module = module_registry[module_label]
@@ -340,7 +359,8 @@ class Application(object):
     """
     if self._state != self.SHUTDOWN:
       raise self.Error('Expected application to be in SHUTDOWN state!')
-    module_registry = AppModule.module_registry()
+    # Reuse the registry that _setup_modules initialized self._init_modules from.
+    module_registry = self._module_registry
     for module_label in reversed(self._init_modules):
       assert module_label in module_registry
       module = module_registry[module_label]
@@ -413,8 +433,10 @@ class Application(object):
     if hasattr(module, 'OPTIONS'):
       if not isinstance(module.OPTIONS, dict):
         raise self.Error('Registered app.Module %s has invalid OPTIONS.' % module.__module__)
+      defaults = {}
       for opt in module.OPTIONS.values():
-        self._add_option(module.__module__, opt)
+        self._add_option(module.__module__, opt, defaults=defaults)
+      self._set_option_defaults(defaults)
       self._configure_options(module.label(), module.OPTIONS)
     self._registered_modules.append(module.label())
 
@@ -429,24 +451,36 @@ class Application(object):
   @pre_initialization
   def _add_module_option(self, module, option):
     calling_module = self._get_module_key(module)
-    if calling_module not in self._global_options:
-      self._global_options[calling_module] = options.new_group(calling_module)
-    self._global_options[calling_module].add_option(option)
+    group = self._global_options.get(calling_module)
+    if group is None:
+      group = self._global_options[calling_module] = options.new_group(calling_module)
+    group.add_option(option)
 
   @staticmethod
   def rewrite_help(op):
+    if getattr(op, '_help_rewritten', False):
+      return
     if hasattr(op, 'help') and isinstance(op.help, Compatibility.string):
-      if op.help.find('%default') != -1 and op.default != optparse.NO_DEFAULT:
+      if '%default' in op.help and op.default != optparse.NO_DEFAULT:
         op.help = op.help.replace('%default', str(op.default))
       else:
         op.help = op.help + ((' [default: %s]' % str(op.default))
           if op.default != optparse.NO_DEFAULT else '')
+      op._help_rewritten = True
 
-  def _add_option(self, calling_module, option):
+  def _add_option(self, calling_module, option, defaults=None):
+    """
+      Add a copy of option on behalf of calling_module.  If defaults is supplied, the
+      option default is collected into it for a later _set_option_defaults rather than
+      being applied immediately.
+    """
     op = copy.deepcopy(option)
     if op.dest and hasattr(op, 'default'):
-      self.set_option(op.dest, op.default if op.default != optparse.NO_DEFAULT else None,
-        force=False)
+      default = op.default if op.default != optparse.NO_DEFAULT else None
+      if defaults is None:
+        self.set_option(op.dest, default, force=False)
+      else:
+        defaults.setdefault(op.dest, default)
       self.rewrite_help(op)
       op.default = optparse.NO_DEFAULT
     if calling_module == '__main__':
@@ -577,10 +611,23 @@ class Application(object):
     for option in getattr(command_function, self.OPTIONS_ATTR, ()):
       self._add_option(module, option)
 
+  @property
+  def _debug(self):
+    # Read through to the live option values, which get_options() hands out for mutation.
+    return getattr(self._option_values, 'twitter_common_app_debug', False)
+
   def _debug_log(self, msg):
-    if hasattr(self._option_values, 'twitter_common_app_debug') and (
-        self._option_values.twitter_common_app_debug):
-      print('twitter.common.app debug: %s' % msg, file=sys.stderr)
+    if not self._debug:
+      return
+    print('twitter.common.app debug: %s' % msg, file=sys.stderr)
+
+  def _set_option_defaults(self, defaults):
+    """
+      Apply a dictionary of option defaults in bulk, skipping any already set.
+    """
+    values = self._option_values.__dict__
+    for dest, value in defaults.items():
+      values.setdefault(dest, value)
 
   def set_option(self, dest, value, force=True):
     """
@@ -617,10 +664,10 @@ class Application(object):
     """
       Return the options only defined by __main__.
     """
+    values = self._option_values.__dict__
     new_values = options.Values()
-    for opt in self._main_options:
-      if opt.dest:
-        setattr(new_values, opt.dest, getattr(self._option_values, opt.dest))
+    new_values.__dict__.update((opt.dest, values[opt.dest]) for opt in self._main_options
+                               if opt.dest and opt.dest in values)
     return new_values
 
   @pre_initialization
@@ -649,9 +696,10 @@ class Application(object):
       Given a multi-line string, resets the indentation to the given number of spaces.
     """
     lines = s.strip().splitlines()
-    lines = ([' ' * first_line_indentation  + line.strip() for line in lines[:1]] +
-             [' ' * other_lines_indentation + line.strip() for line in lines[1:]])
-    return '\n'.join(lines)
+    if not lines:
+      return ''
+    separator = '\n' + ' ' * other_lines_indentation
+    return ' ' * first_line_indentation + separator.join([line.strip() for line in lines])
 
   def error(self, message):
     """
@@ -688,15 +736,17 @@ class Application(object):
         return 'unknown'
 
   def quit(self, return_code):
-    nondaemons = 0
-    for thr in threading.enumerate():
-      self._debug_log('  Active thread%s: %s' % (' (daemon)' if thr.isDaemon() else '', thr))
-      if thr is not threading.current_thread() and not thr.isDaemon():
-        nondaemons += 1
-    if nondaemons:
-      self._debug_log('More than one active non-daemon thread, your application may hang!')
-    else:
-      self._debug_log('Exiting cleanly.')
+    # The thread scan is purely informational, so only pay for it when debugging.
+    if self._debug:
+      nondaemons = 0
+      for thr in threading.enumerate():
+        self._debug_log('  Active thread%s: %s' % (' (daemon)' if thr.daemon else '', thr))
+        if thr is not threading.current_thread() and not thr.daemon:
+          nondaemons += 1
+      if nondaemons:
+        self._debug_log('More than one active non-daemon thread, your application may hang!')
+      else:
+        self._debug_log('Exiting cleanly.')
     self._exit_function(return_code)
 
   def profiler(self):
@@ -772,7 +822,12 @@ class Application(object):
     except Exception as e:
       return_code = 1
       self._debug_log('%s excepted with %s' % (method_name, type(e)))
-      sys.excepthook(*sys.exc_info())
+      # App modules (e.g. the exception handlers) may install their own excepthook, which
+      # must still see the exception; otherwise print it directly.
+      if sys.excepthook is sys.__excepthook__:
+        traceback.print_exc()
+      else:
+        sys.excepthook(*sys.exc_info())
     return return_code
 
   @post_initialization
@@ -16,84 +16,116 @@
 
 from __future__ import print_function
 
-import inspect
 import os
 import sys
 
+try:
+  from pkgutil import ImpLoader
+except ImportError:
+  ImpLoader = None
+
+
+_MISSING = object()
+
+
 class Inspection(object):
   class InternalError(Exception): pass
 
-  # TODO(wickman)
-  #   Remove all calls to inspect.stack().  This is just bad.  Port everything over
-  #   to iterating from currentframe => outer frames.
+  # The application name is derived from the __main__ module, which does not change over
+  # the lifetime of the process, so it is computed at most once.
+  _APPLICATION_NAME = None
+  _MAIN_LOCALS = None
+
+  # The frame walks below bind sys._getframe as a default argument and read f_locals (which
+  # is rebuilt on each access for function frames) at most once per frame.
   @staticmethod
-  def find_main_from_caller():
-    last_frame = inspect.currentframe()
-    while True:
-      inspect_frame = last_frame.f_back
-      if not inspect_frame:
-        break
-      if 'main' in inspect_frame.f_locals:
-        return inspect_frame.f_locals['main']
-      last_frame = inspect_frame
+  def find_main_from_caller(_getframe=sys._getframe, _missing=_MISSING):
+    frame = _getframe(1)
+    while frame is not None:
+      # Only materialize f_locals for frames whose code can actually bind 'main'.
+      code = frame.f_code
+      if ('main' in code.co_names or 'main' in code.co_varnames or
+          'main' in code.co_cellvars or 'main' in code.co_freevars):
+        main = frame.f_locals.get('main', _missing)
+        if main is not _missing:
+          return main
+      frame = frame.f_back
     raise Inspection.InternalError("Unable to detect main from the stack!")
 
   @staticmethod
-  def print_stack_locals(out=sys.stderr):
-    stack = inspect.stack()[1:]
-    for fr_n in range(len(stack)):
+  def print_stack_locals(out=sys.stderr, _getframe=sys._getframe):
+    frame = _getframe(1)
+    fr_n = 0
+    while frame is not None:
       print('--- frame %s ---\n' % fr_n, file=out)
-      for key in stack[fr_n][0].f_locals:
-        print('  %s => %s' % (key, stack[fr_n][0].f_locals[key]), file=out)
+      for key, value in frame.f_locals.items():
+        print('  %s => %s' % (key, value), file=out)
+      frame = frame.f_back
+      fr_n += 1
 
   @staticmethod
-  def find_main_module():
-    stack = inspect.stack()[1:]
-    for fr_n in range(len(stack)):
-      if 'main' in stack[fr_n][0].f_locals:
-        return stack[fr_n][0].f_locals['__name__']
+  def find_main_module(_getframe=sys._getframe):
+    frame = _getframe(1)
+    while frame is not None:
+      frame_locals = frame.f_locals
+      if 'main' in frame_locals:
+        return frame_locals['__name__']
+      frame = frame.f_back
     return None
 
   @staticmethod
-  def get_main_locals():
-    stack = inspect.stack()[1:]
-    for fr_n in range(len(stack)):
-      if '__name__' in stack[fr_n][0].f_locals and (
-          stack[fr_n][0].f_locals['__name__'] == '__main__'):
-        return stack[fr_n][0].f_locals
+  def get_main_locals(_getframe=sys._getframe):
+    """
+      Return the locals of the __main__ module frame, or {} if it is not on the stack.
+
+      The module-level locals of __main__ are the module's globals dict, which lives as long
+      as the process, so the first successful lookup is cached.  Re-executing __main__ with a
+      different namespace (e.g. via exec) is not supported.
+    """
+    if Inspection._MAIN_LOCALS is not None:
+      return Inspection._MAIN_LOCALS
+    frame = _getframe(1)
+    while frame is not None:
+      frame_locals = frame.f_locals
+      if frame_locals.get('__name__') == '__main__':
+        Inspection._MAIN_LOCALS = frame_locals
+        return frame_locals
+      frame = frame.f_back
     return {}
 
   @staticmethod
-  def find_calling_module():
-    last_frame = inspect.currentframe()
-    while True:
-      inspect_frame = last_frame.f_back
-      if not inspect_frame:
-        break
-      if '__name__' in inspect_frame.f_locals:
-        return inspect_frame.f_locals['__name__']
-      last_frame = inspect_frame
+  def find_calling_module(_getframe=sys._getframe, _missing=_MISSING):
+    frame = _getframe(1)
+    while frame is not None:
+      name = frame.f_locals.get('__name__', _missing)
+      if name is not _missing:
+        return name
+      frame = frame.f_back
     raise Inspection.InternalError("Unable to interpret stack frame!")
 
   @staticmethod
   def find_application_name():
-    __entry_point__ = None
+    if Inspection._APPLICATION_NAME is not None:
+      return Inspection._APPLICATION_NAME
     locals = Inspection.get_main_locals()
-    if '__file__' in locals and locals['__file__'] is not None:
-      __entry_point__ = locals['__file__']
-    elif '__loader__' in locals:
-      from zipimport import zipimporter
-      from pkgutil import ImpLoader
-      # TODO(wickman) The monkeypatched zipimporter should probably not be a function
-      # but instead a properly delegating proxy.
-      if hasattr(locals['__loader__'], 'archive'):
-        # assuming it ends in .zip or .egg, it may be of package format, so
-        # foo-version-py2.6-arch.egg, so split off anything after '-'.
-        __entry_point__ = os.path.basename(locals['__loader__'].archive)
-        __entry_point__ = __entry_point__.split('-')[0].split('.')[0]
-      elif isinstance(locals['__loader__'], ImpLoader):
-        __entry_point__ = locals['__loader__'].get_filename()
-    else:
-      __entry_point__ = '__interpreter__'
-    app_name = os.path.basename(__entry_point__)
-    return app_name.split('.')[0]
+    entry_point = locals.get('__file__')
+    if entry_point is None:
+      if '__loader__' not in locals:
+        entry_point = '__interpreter__'
+      else:
+        loader = locals['__loader__']
+        # TODO(wickman) The monkeypatched zipimporter should probably not be a function
+        # but instead a properly delegating proxy.
+        if hasattr(loader, 'archive'):
+          # assuming it ends in .zip or .egg, it may be of package format, so
+          # foo-version-py2.6-arch.egg, so split off anything after '-'.
+          entry_point = os.path.basename(loader.archive).partition('-')[0]
+        elif ImpLoader is not None and isinstance(loader, ImpLoader):
+          entry_point = loader.get_filename()
+        else:
+          raise Inspection.InternalError('Unable to determine the entry point of __main__!')
+    app_name = os.path.basename(entry_point).partition('.')[0]
+    # Only cache once __main__ was found: off the main thread its frame is not on the stack.
+    if locals:
+      Inspection._APPLICATION_NAME = app_name
+    return app_name
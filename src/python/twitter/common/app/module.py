@@ -18,7 +18,20 @@ from collections import defaultdict
 
 from twitter.common.collections import maybe_list
 from twitter.common.lang import Compatibility, Singleton
-from twitter.common.util import topological_sort, DependencyCycle
+
+
+def _reaches(graph, source, target):
+  """Return True if target is reachable from source by following edges in graph."""
+  visited = set()
+  pending = list(graph.get(source, ()))
+  while pending:
+    node = pending.pop()
+    if node == target:
+      return True
+    if node not in visited:
+      visited.add(node)
+      pending.extend(graph.get(node, ()))
+  return False
 
 
 class AppModule(Singleton):
@@ -68,9 +81,8 @@ class AppModule(Singleton):
     self._MODULE_DEPENDENCIES[label].update(self._dependencies)
     for dependent in self._dependents:
       self._MODULE_DEPENDENCIES[dependent].add(label)
-    try:
-      list(topological_sort(self._MODULE_DEPENDENCIES))
-    except DependencyCycle:
+    # Every edge added above starts or ends at label, so any new cycle must pass through it.
+    if _reaches(self._MODULE_DEPENDENCIES, label, label):
       raise AppModule.DependencyCycle("Found a cycle in app module dependencies!")
 
   def description(self):
@@ -70,11 +70,12 @@ class RootServer(HttpServer, app.Module):
 
     'framework':
       options.Option('--http_framework',
-          default='wsgiref',
+          default='threaded_wsgiref',
           type='string',
           metavar='FRAMEWORK',
           dest='twitter_common_http_root_server_framework',
-          help='The framework that will be running the integrated http server.')
+          help='The framework that will be running the integrated http server.  The default '
+               'threaded_wsgiref handles each request in its own thread.')
   }
 
   def __init__(self):
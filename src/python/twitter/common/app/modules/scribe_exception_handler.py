@@ -14,14 +14,75 @@
 # limitations under the License.
 # ==================================================================================================
 
+import socket
 import sys
+import threading
+
+try:
+  from Queue import Queue, Empty, Full
+except ImportError:
+  from queue import Queue, Empty, Full
+
 from twitter.common import app, options
 from twitter.common.exceptions import BasicExceptionHandler
+from twitter.common.metrics import AtomicGauge, RootMetrics
 
 from scribe import scribe
 from thrift.transport import TTransport, TSocket
 from thrift.protocol import TBinaryProtocol
 
+
+# Each thread keeps its own connected client, so that an exception does not pay for a TCP
+# connect and teardown, and clients are never shared across threads.
+_CLIENT_TLS = threading.local()
+
+
+def _protocol_class():
+  """
+    The C-accelerated binary protocol, unless the generated scribe code was built against a
+    thrift whose fastbinary extension cannot encode it, in which case the pure-Python one.
+  """
+  try:
+    protocol = TBinaryProtocol.TBinaryProtocolAccelerated(TTransport.TMemoryBuffer())
+    scribe.LogEntry(category='', message='').write(protocol)
+    return TBinaryProtocol.TBinaryProtocolAccelerated
+  except TypeError:
+    return TBinaryProtocol.TBinaryProtocol
+
+
+_PROTOCOL_CLASS = _protocol_class()
+
+
+class ScribeDrainer(threading.Thread):
+  """
+    Drains formatted exceptions from a queue and scribes them in batches, so that the thread
+    that raised does not block on scribe.  A None on the queue stops the drainer once the
+    messages queued before it have been written.
+  """
+
+  BATCH_SIZE = 100
+
+  def __init__(self, queue):
+    self._queue = queue
+    threading.Thread.__init__(self, name='ScribeDrainer')
+    self.daemon = True
+
+  def run(self):
+    stopped = False
+    while not stopped:
+      batch = [self._queue.get()]
+      while len(batch) < self.BATCH_SIZE:
+        try:
+          batch.append(self._queue.get_nowait())
+        except Empty:
+          break
+      if None in batch:
+        batch = batch[:batch.index(None)]
+        stopped = True
+      if batch:
+        AppScribeExceptionHandler.scribe_messages(batch)
+
+
 class AppScribeExceptionHandler(app.Module):
   """
     An application module that logs or scribes uncaught exceptions.
@@ -52,18 +113,37 @@ class AppScribeExceptionHandler(app.Module):
   }
 
 
+  QUEUE_SIZE = 10000
+  DRAIN_TIMEOUT_SECS = 5
+
   def __init__(self):
     app.Module.__init__(self, __name__, description="twitter.common.log handler.")
 
   def setup_function(self):
     self._builtin_hook = sys.excepthook
+    self._queue = Queue(maxsize=self.QUEUE_SIZE)
+    self._dropped = AtomicGauge('dropped')
+    RootMetrics().scope('scribe_exceptions').register(self._dropped)
+    self._drainer = ScribeDrainer(self._queue)
+    self._drainer.start()
     def forwarding_handler(*args, **kw):
-      AppScribeExceptionHandler.scribe_error(*args, **kw)
+      try:
+        self._queue.put_nowait(BasicExceptionHandler.format(*args, **kw))
+      except Full:
+        self._dropped.increment()
       self._builtin_hook(*args, **kw)
     sys.excepthook = forwarding_handler
 
   def teardown_function(self):
     sys.excepthook = getattr(self, '_builtin_hook', sys.__excepthook__)
+    drainer = getattr(self, '_drainer', None)
+    if drainer is not None:
+      # Give already queued exceptions a chance to be written before the process exits.
+      try:
+        self._queue.put(None, timeout=self.DRAIN_TIMEOUT_SECS)
+      except Full:
+        return
+      drainer.join(self.DRAIN_TIMEOUT_SECS)
 
   @staticmethod
   def log_error(msg):
@@ -73,23 +153,55 @@ class AppScribeExceptionHandler(app.Module):
     except ImportError:
       sys.stderr.write(msg + '\n')
 
+  @staticmethod
+  def _get_client(host, port):
+    """
+      Return this thread's connected (client, transport) for host:port, connecting if needed.
+    """
+    cached = getattr(_CLIENT_TLS, 'client', None)
+    if cached is not None and cached[0] == (host, port):
+      return cached[1], cached[2]
+    AppScribeExceptionHandler._drop_client()
+    tsocket = TSocket.TSocket(host=host, port=port)
+    transport = TTransport.TFramedTransport(tsocket)
+    protocol = _PROTOCOL_CLASS(trans=transport, strictRead=False, strictWrite=False)
+    client = scribe.Client(iprot=protocol, oprot=protocol)
+    transport.open()
+    if getattr(tsocket, 'handle', None) is not None:
+      tsocket.handle.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    _CLIENT_TLS.client = ((host, port), client, transport)
+    return client, transport
+
+  @staticmethod
+  def _drop_client():
+    cached = getattr(_CLIENT_TLS, 'client', None)
+    _CLIENT_TLS.client = None
+    if cached is not None:
+      try:
+        cached[2].close()
+      except TTransport.TTransportException:
+        pass
+
   @staticmethod
   def scribe_error(*args, **kw):
+    AppScribeExceptionHandler.scribe_messages([BasicExceptionHandler.format(*args, **kw)])
+
+  @staticmethod
+  def scribe_messages(messages):
     options = app.get_options()
-    socket = TSocket.TSocket(host=options.twitter_common_scribe_host,
-                             port=options.twitter_common_scribe_port)
-    transport = TTransport.TFramedTransport(socket)
-    protocol = TBinaryProtocol.TBinaryProtocol(trans=transport, strictRead=False, strictWrite=False)
-    client = scribe.Client(iprot=protocol, oprot=protocol)
-    value = BasicExceptionHandler.format(*args, **kw)
-    log_entry = scribe.LogEntry(category=options.twitter_common_scribe_category,
-      message=value)
+    log_entries = [scribe.LogEntry(category=options.twitter_common_scribe_category, message=value)
+                   for value in messages]
 
-    try:
-      transport.open()
-      result = client.Log(messages=[log_entry])
-      transport.close()
-      if result != scribe.ResultCode.OK:
-        AppScribeExceptionHandler.log_error('Failed to scribe exception!')
-    except TTransport.TTransportException:
-      AppScribeExceptionHandler.log_error('Could not connect to scribe!')
+    # A cached connection may have been closed by the aggregator since it was last used, so a
+    # transport failure is retried once on a fresh connection.
+    for attempt in range(2):
+      try:
+        client, _ = AppScribeExceptionHandler._get_client(options.twitter_common_scribe_host,
+                                                          options.twitter_common_scribe_port)
+        result = client.Log(messages=log_entries)
+        if result != scribe.ResultCode.OK:
+          AppScribeExceptionHandler.log_error('Failed to scribe exception!')
+        return
+      except TTransport.TTransportException:
+        AppScribeExceptionHandler._drop_client()
+    AppScribeExceptionHandler.log_error('Could not connect to scribe!')
@@ -14,9 +14,16 @@
 # limitations under the License.
 # ==================================================================================================
 
+import os
+import socket
 import sys
 import threading
 
+try:
+  from Queue import Queue, Empty, Full
+except ImportError:
+  from queue import Queue, Empty, Full
+
 from twitter.common import app, options
 
 try:
@@ -24,6 +31,18 @@ try:
 except ImportError:
   import logging as log
 
+try:
+  from twitter.common.zookeeper.client import ZooKeeper
+  from twitter.common.zookeeper.serverset import Endpoint, ServerSet
+  _HAVE_ZK = True
+except ImportError:
+  _HAVE_ZK = False
+
+# The host advertised in the serverset, resolved once rather than on every (re)construction.
+# TWITTER_COMMON_HOSTNAME overrides it where gethostname() is not the reachable name, e.g. in
+# containers.
+_HOSTNAME = os.environ.get('TWITTER_COMMON_HOSTNAME') or socket.gethostname()
+
 class ParseError(Exception): pass
 
 def add_port_to(option_name):
@@ -88,7 +107,8 @@ class ServerSetModule(app.Module):
     self._membership = None
     self._join_args = None
     self._torndown = False
-    self._rejoin_event = threading.Event()
+    # Holds at most one pending rejoin request: requests made while one is pending coalesce.
+    self._rejoin_queue = Queue(maxsize=1)
     self._joiner = None
 
   @property
@@ -104,6 +124,8 @@ class ServerSetModule(app.Module):
     if not options.serverset_module_enable:
       return
 
+    assert _HAVE_ZK, (
+        'If serverset module enabled, the twitter.common.zookeeper bindings must be importable.')
     assert options.serverset_module_path is not None, (
         'If serverset module enabled, serverset path must be specified.')
     assert options.serverset_module_primary_port is not None, (
@@ -120,14 +142,9 @@ class ServerSetModule(app.Module):
       raise ValueError('Could not parse serverset primary port: %s' % e)
 
   def _construct_serverset(self, options):
-    import socket
-    import threading
-    import zookeeper
-    from twitter.common.zookeeper.client import ZooKeeper
-    from twitter.common.zookeeper.serverset import Endpoint, ServerSet
     log.debug('ServerSet module constructing serverset.')
 
-    hostname = socket.gethostname()
+    hostname = _HOSTNAME
     primary_port = int(options.serverset_module_primary_port)
     primary = Endpoint(hostname, primary_port)
     additional = dict((port_name, Endpoint(hostname, port_number))
@@ -157,19 +174,35 @@ class ServerSetModule(app.Module):
     else:
       log.debug('Rejoining...')
 
-    self._rejoin_event.set()
+    self._request_join()
+
+  def _request_join(self):
+    try:
+      self._rejoin_queue.put_nowait(True)
+    except Full:
+      pass
 
   def setup_function(self):
     options = app.get_options()
     if options.serverset_module_enable:
       self._assert_valid_inputs(options)
       self._construct_serverset(options)
-      self._thread = ServerSetJoinThread(self._rejoin_event, self._join)
+      self._thread = ServerSetJoinThread(self._rejoin_queue, self._join)
       self._thread.start()
-      self._rejoin_event.set()
+      self._request_join()
 
   def teardown_function(self):
     self._torndown = True
+    # Stop the join thread; it exits on None.  A pending rejoin is moot after teardown.
+    while True:
+      try:
+        self._rejoin_queue.put_nowait(None)
+        break
+      except Full:
+        try:
+          self._rejoin_queue.get_nowait()
+        except Empty:
+          pass
     if self._membership:
       self._serverset.cancel(self._membership)
       self._zookeeper.stop()
@@ -179,15 +212,13 @@ class ServerSetJoinThread(threading.Thread):
   """
     A thread to maintain serverset session.
   """
-  def __init__(self, event, joiner):
-    self._event = event
+  def __init__(self, queue, joiner):
+    self._queue = queue
     self._joiner = joiner
     threading.Thread.__init__(self)
     self.daemon = True
 
   def run(self):
-    while True:
-      self._event.wait()
+    while self._queue.get() is not None:
       log.debug('Join event triggered, joining serverset.')
-      self._event.clear()
       self._joiner()
@@ -19,19 +19,25 @@
 # Any resemblance to real persons, living or dead, is purely coincidental.
 
 from functools import wraps
+import itertools
+import json
+import multiprocessing
 import os
 import re
 import sys
+import threading
 import time
+import uuid
 
 from twitter.common import app, options
 from twitter.common.http import HttpServer, Plugin
+from twitter.common.lang import Compatibility
 from twitter.common.http.server import request
 from twitter.common.metrics import (
   AtomicGauge,
   Label,
   LambdaGauge,
-  MetricSampler,
+  LazyMetricSampler,
   MutatorGauge,
   Observable,
   RootMetrics,
@@ -47,6 +53,42 @@ try:
 except ImportError:
   HAS_PEX = False
 
+try:
+  import re2
+  HAS_RE2 = True
+except ImportError:
+  HAS_RE2 = False
+
+try:
+  import orjson
+  HAS_ORJSON = True
+except ImportError:
+  HAS_ORJSON = False
+
+
+try:
+  from time import monotonic_ns
+except ImportError:
+  # Python < 3.7: the float monotonic clock where it exists (3.3+), else wall time.
+  def monotonic_ns(_clock=getattr(time, 'monotonic', time.time)):
+    return int(_clock() * 1e9)
+
+
+def dumps_json(value):
+  """
+    Encode value as compact JSON bytes with orjson when it is available, falling back to the json
+    module for values orjson does not handle (e.g. integers beyond 64 bits).
+  """
+  if HAS_ORJSON:
+    try:
+      return orjson.dumps(value)
+    except TypeError:
+      pass
+  body = json.dumps(value, separators=(',', ':'))
+  if not isinstance(body, Compatibility.bytes):
+    body = body.encode('utf-8')
+  return body
+
 
 def set_bool(option, opt_str, value, parser):
   setattr(parser.values, option.dest, not opt_str.startswith('--no'))
@@ -115,73 +157,192 @@ class VarsSubsystem(app.Module):
     if len(regexes_list) > 0:
       # safeguard against partial matches
       full_regexes = ['^' + regex + '$' for regex in regexes_list]
-      return re.compile('(' + ")|(".join(full_regexes) + ')')
+      pattern = '(?:' + ")|(?:".join(full_regexes) + ')'
+      # RE2 matches the whole alternation in one linear-time pass, with no backtracking.  It
+      # rejects some constructs (e.g. backreferences), so fall back to re for those.
+      if HAS_RE2:
+        try:
+          return re2.compile(pattern)
+        except re2.error:
+          pass
+      return re.compile(pattern)
     else:
       return None
 
 
 class VarsEndpoint(object):
   """
-    Wrap a MetricSampler to export the /vars endpoint for applications that register
+    Wrap a LazyMetricSampler to export the /vars endpoint for applications that register
     exported variables.
   """
 
   def __init__(self, period=None, stats_filter=None):
     self._metrics = RootMetrics()
     self._stats_filter = stats_filter
+    # Samples are taken on demand by requests, at most once per period, so an application that
+    # is never scraped pays for no sampling thread at all.
     if period is not None:
-      self._monitor = MetricSampler(self._metrics, period)
+      self._monitor = LazyMetricSampler(self._metrics, period)
     else:
-      self._monitor = MetricSampler(self._metrics)
-    self._monitor.start()
+      self._monitor = LazyMetricSampler(self._metrics)
+    # The rendered /vars and /vars.json bodies only change when the sampler takes a new sample,
+    # so they are cached per (format, filtered) as (epoch, body) and shared by every request
+    # within a sampling period.
+    self._cache = {}
+    self._cache_lock = threading.Lock()
+    # Epochs restart at zero with every sampler, so ETags also carry a per-endpoint token.
+    self._etag_prefix = uuid.uuid4().hex[:16]
+    # The sorted (and lazily filtered) metric names from the last render, guarded by _cache_lock.
+    self._sorted_keys, self._filtered_keys = [], None
+    # Formatted /vars lines by metric name, as (value, line), guarded by _cache_lock.
+    self._line_cache = {}
 
   @HttpServer.route("/vars")
   @HttpServer.route("/vars/:var")
   def handle_vars(self, var=None):
     HttpServer.set_content_type('text/plain; charset=iso-8859-1')
     filtered = self._parse_filtered_arg()
-    samples = self._monitor.sample()
-
-    if var is None and filtered and self._stats_filter:
-      return '\n'.join(
-        '%s %s' % (key, val) for key, val in sorted(samples.items())
-                  if not self._stats_filter.match(key))
-    elif var is None:
-      return '\n'.join(
-        '%s %s' % (key, val) for key, val in sorted(samples.items()))
+
+    if var is None:
+      return self._render_vars(filtered and self._stats_filter is not None)
     else:
+      samples = self._monitor.sample()
       if var in samples:
         return samples[var]
       else:
         HttpServer.abort(404, 'Unknown exported variable')
 
+  def _render_vars(self, filtered):
+    def render(samples, keys):
+      body = '\n'.join(self._lines(samples, keys))
+      # Encode once per sample in the advertised charset, so that bottle passes the cached
+      # bytes through instead of encoding text on every request.
+      if not isinstance(body, Compatibility.bytes):
+        body = body.encode('iso-8859-1', 'replace')
+      return body
+    return self._respond('text', filtered, render)
+
+  def _render_vars_json(self, filtered):
+    return self._respond('json', filtered,
+        lambda samples, keys: dumps_json(dict((key, samples[key]) for key in keys)))
+
+  def _respond(self, kind, filtered, render):
+    """
+      Return the cached body, tagged with an ETag for its sample epoch, or an empty 304 when
+      the client's If-None-Match shows it already has this sample.
+    """
+    epoch, body = self._cached(kind, filtered, render)
+    etag = '"%s-%d-%s-%d"' % (self._etag_prefix, epoch, kind, int(filtered))
+    HttpServer.response.set_header('ETag', etag)
+    if_none_match = request.environ.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+      HttpServer.response.status = 304
+      return ''
+    return body
+
+  def _cached(self, kind, filtered, render):
+    # Read the epoch before the sample: caching a newer sample under an older epoch costs at
+    # most one extra render, whereas the reverse would serve a stale body for a whole period.
+    epoch = self._monitor.epoch()
+    cached = self._cache.get((kind, filtered))
+    if cached is not None and cached[0] == epoch:
+      return cached
+    with self._cache_lock:
+      cached = self._cache.get((kind, filtered))
+      if cached is not None and cached[0] == epoch:
+        return cached
+      samples = self._monitor.sample()
+      cached = (epoch, render(samples, self._keys(samples, filtered)))
+      self._cache[(kind, filtered)] = cached
+      return cached
+
+  # Values of these types cannot change in place, so a formatted line stays valid for as long
+  # as the sampled value compares equal (and has the same type, since 1 == 1.0 == True).
+  _LINE_CACHEABLE = Compatibility.numeric + Compatibility.string + (type(None),)
+
+  def _lines(self, samples, keys):
+    # Most exported values (labels, idle counters) do not change between samples, so their
+    # formatted '<name> <value>' lines are kept and only changed values are re-formatted.
+    lines, cacheable = self._line_cache, self._LINE_CACHEABLE
+    rendered = []
+    for key in keys:
+      value = samples[key]
+      cached = lines.get(key)
+      if cached is None or type(cached[0]) is not type(value) or cached[0] != value:
+        line = '%s %s' % (key, value)
+        if isinstance(value, cacheable):
+          lines[key] = (value, line)
+        else:
+          lines.pop(key, None)
+        rendered.append(line)
+      else:
+        rendered.append(cached[1])
+    return rendered
+
+  def _keys(self, samples, filtered):
+    # The set of exported names rarely changes between samples, so the sorted and filtered key
+    # lists are kept until it does instead of re-sorting and re-matching on every render.
+    keys = self._sorted_keys
+    if len(keys) != len(samples) or not all(key in samples for key in keys):
+      keys = self._sorted_keys = sorted(samples)
+      self._filtered_keys = None
+      self._line_cache = dict(
+          (key, line) for key, line in self._line_cache.items() if key in samples)
+    if not filtered:
+      return keys
+    if self._filtered_keys is None:
+      self._filtered_keys = [key for key in keys if not self._stats_filter.match(key)]
+    return self._filtered_keys
+
   @HttpServer.route("/vars.json")
   def handle_vars_json(self, var=None, value=None):
+    HttpServer.set_content_type('application/json')
     filtered = self._parse_filtered_arg()
-    sample = self._monitor.sample()
-    if filtered and self._stats_filter:
-      return dict((key, val) for key, val in sample.items() if not self._stats_filter.match(key))
-    else:
-      return sample
+    return self._render_vars_json(filtered and self._stats_filter is not None)
 
   def shutdown(self):
-    self._monitor.shutdown()
-    self._monitor.join()
+    # Nothing to stop: samples are taken on the requesting threads.
+    pass
 
   def _parse_filtered_arg(self):
     return request.GET.get('filtered', '') in ('true', '1')
 
 
+def _shard_count():
+  try:
+    return 2 * multiprocessing.cpu_count()
+  except NotImplementedError:
+    return 8
+
+
 class StatusStats(Observable):
+  """
+    Request count and total latency for one status bucket.  Each thread updates one of SHARDS
+    gauge pairs, assigned round-robin on first use, so that concurrent requests do not all
+    contend on the same two locks; the exported gauges sum the shards when read.
+  """
+
+  SHARDS = _shard_count()
+
   def __init__(self):
-    self._count = AtomicGauge('count')
-    self._ns = AtomicGauge('total_ns')
-    self.metrics.register(self._count)
-    self.metrics.register(self._ns)
+    self._count_shards = [AtomicGauge('count') for _ in range(self.SHARDS)]
+    self._ns_shards = [AtomicGauge('total_ns') for _ in range(self.SHARDS)]
+    self._shard_ids = itertools.count()
+    self._local = threading.local()
+    self.metrics.register(LambdaGauge('count', lambda: self._sum(self._count_shards)))
+    self.metrics.register(LambdaGauge('total_ns', lambda: self._sum(self._ns_shards)))
+
+  @staticmethod
+  def _sum(shards):
+    return sum(shard.read() for shard in shards)
 
   def increment(self, ns):
-    self._count.increment()
-    self._ns.add(ns)
+    shard = getattr(self._local, 'shard', None)
+    if shard is None:
+      # itertools.count.__next__ is atomic under the GIL.
+      shard = self._local.shard = next(self._shard_ids) % self.SHARDS
+    self._count_shards[shard].increment()
+    self._ns_shards[shard].add(ns)
 
 
 class EndpointTracePlugin(Observable, Plugin):
@@ -189,24 +350,26 @@ class EndpointTracePlugin(Observable, Plugin):
     self._stats = dict((k, StatusStats()) for k in (1, 2, 3, 4, 5))
     for code_prefix, observable in self._stats.items():
       self.metrics.register_observable('%dxx' % code_prefix, observable)
+    # Indexed by status_code // 100, so that each request does a list index, not a dict lookup.
+    self._stats_by_bucket = [self._stats.get(bucket) for bucket in range(6)]
 
   def apply(self, callback, route):
     @wraps(callback)
     def wrapped_callback(*args, **kw):
-      start = time.time()
+      start = monotonic_ns()
       body = callback(*args, **kw)
-      ns = int((time.time() - start) * 1e9)
-      observable = self._stats.get(HttpServer.response.status_code / 100)
-      if observable:
-        observable.increment(ns)
+      ns = monotonic_ns() - start
+      bucket = HttpServer.response.status_code // 100
+      if 0 < bucket < 6:
+        self._stats_by_bucket[bucket].increment(ns)
       return body
     return wrapped_callback
 
 
 def register_diagnostics():
   rm = RootMetrics().scope('sys')
-  now = time.time()
-  rm.register(LambdaGauge('uptime', lambda: time.time() - now))
+  clock = getattr(time, 'monotonic', time.time)
+  rm.register(LambdaGauge('uptime', lambda _clock=clock, _start=clock(): _clock() - _start))
   rm.register(Label('argv', repr(sys.argv)))
   rm.register(Label('path', repr(sys.path)))
   rm.register(Label('version', sys.version))
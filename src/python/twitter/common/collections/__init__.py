@@ -16,6 +16,11 @@
 
 from sys import version_info
 
+try:
+  from collections.abc import Iterable
+except ImportError:
+  from collections import Iterable
+
 from twitter.common.lang import Compatibility
 
 if version_info[0] == 2:
@@ -38,7 +43,6 @@ def maybe_list(value, expected_type=Compatibility.string, raise_type=ValueError)
 
   Raises ValueError if any type mismatches.
   """
-  from collections import Iterable
   if isinstance(value, expected_type):
     return [value]
   elif isinstance(value, Iterable):
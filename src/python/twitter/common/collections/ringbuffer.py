@@ -57,17 +57,22 @@ class RingBuffer(list):
     self._size = size
 
   def __index(self, key):
-    if not self._count:
+    # _zero, the storage slot of the oldest element, is kept in [0, _size).
+    count = self._count
+    if not count:
       raise IndexError('list index out of range')
-    return (key + self._zero) % self._count
+    if not self._zero and 0 <= key < count:
+      return key
+    return (key + self._zero) % count
 
   def append(self, value):
     if self._count < self._size:
       super(RingBuffer, self).append(value)
       self._count += 1
     else:
-      super(RingBuffer, self).__setitem__(self._zero % self._size, value)
-      self._zero += 1
+      super(RingBuffer, self).__setitem__(self._zero, value)
+      zero = self._zero + 1
+      self._zero = 0 if zero == self._size else zero
 
   def __getitem__(self, key):
     return super(RingBuffer, self).__getitem__(self.__index(key))
@@ -85,5 +90,13 @@ class RingBuffer(list):
     return "RingBuffer(size=%s, %s)" % (self._size, str(self))
 
   def __iter__(self):
-    for x in xrange(0, self._count):
-      yield self[x]
+    return iter(self.tolist())
+
+  def tolist(self):
+    """Return the contents, oldest first, as a plain list."""
+    # The storage is in order until it wraps; after that it is two contiguous runs split at the
+    # oldest element, so two slices rebuild it without indexing element by element.
+    zero = self._zero
+    if not zero:
+      return list.__getitem__(self, slice(None))
+    return list.__getitem__(self, slice(zero, None)) + list.__getitem__(self, slice(None, zero))
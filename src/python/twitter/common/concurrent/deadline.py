@@ -14,13 +14,16 @@
 # limitations under the License.
 # ==================================================================================================
 
+import atexit
+import sys
+import threading
+import traceback
+
 try:
   from Queue import Queue, Empty
 except ImportError:
   from queue import Queue, Empty
 
-from threading import Thread
-
 from twitter.common.lang import Compatibility
 from twitter.common.quantity import Amount, Time
 
@@ -29,7 +32,92 @@ class Timeout(Exception):
   pass
 
 
-def deadline(closure, timeout=Amount(150, Time.MILLISECONDS), daemon=False, propagate=False):
+_DEFAULT_TIMEOUT = Amount(150, Time.MILLISECONDS)
+_DEFAULT_TIMEOUT_SECS = _DEFAULT_TIMEOUT.as_(Time.SECONDS)
+
+
+class _WorkerPool(object):
+  """A cached pool of worker threads used to run deadline() closures.
+
+    Idle workers are reused across calls; a new worker is only spawned when none are idle, so a
+    closure that blows its deadline never delays the closures submitted after it.  Workers that
+    sit idle for IDLE_TIMEOUT_SECS exit.
+
+    Workers are always daemon threads so that idle ones never hold up interpreter exit.  A
+    non-daemon pool instead joins its workers at exit, letting in-flight closures run to
+    completion as a non-daemon thread would.
+  """
+
+  IDLE_TIMEOUT_SECS = 60.0
+
+  def __init__(self, daemon):
+    self._lock = threading.Lock()
+    self._work = Queue()
+    self._workers = set()
+    # Number of idle workers minus the number of queued work items; only mutated (and the work
+    # queue only written to) under self._lock.
+    self._idle = 0
+    if not daemon:
+      atexit.register(self._join)
+
+  def submit(self, work):
+    with self._lock:
+      if self._idle > 0:
+        self._idle -= 1
+        self._work.put(work)
+        return
+      worker = threading.Thread(target=self._run, args=(work,), name='deadline')
+      worker.daemon = True
+      self._workers.add(worker)
+    worker.start()
+
+  def _run(self, work):
+    try:
+      while work is not None:
+        work()
+        with self._lock:
+          self._idle += 1
+        try:
+          work = self._work.get(timeout=self.IDLE_TIMEOUT_SECS)
+        except Empty:
+          with self._lock:
+            try:
+              work = self._work.get_nowait()
+            except Empty:
+              self._idle -= 1
+              return
+        if work is None:
+          with self._lock:
+            self._idle -= 1
+    finally:
+      with self._lock:
+        self._workers.discard(threading.current_thread())
+
+  def _join(self):
+    with self._lock:
+      workers = list(self._workers)
+      for _ in workers:
+        self._work.put(None)
+    for worker in workers:
+      worker.join()
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _pool(daemon):
+  daemon = bool(daemon)
+  pool = _POOLS.get(daemon)
+  if pool is None:
+    with _POOLS_LOCK:
+      pool = _POOLS.get(daemon)
+      if pool is None:
+        pool = _POOLS[daemon] = _WorkerPool(daemon)
+  return pool
+
+
+def deadline(closure, timeout=_DEFAULT_TIMEOUT, daemon=False, propagate=False):
   """Run a closure with a timeout, raising an exception if the timeout is exceeded.
 
     args:
@@ -42,28 +130,29 @@ def deadline(closure, timeout=Amount(150, Time.MILLISECONDS), daemon=False, prop
       propagate - booleanish indicating whether to re-raise exceptions thrown by the closure
                   [default: False]
   """
-  if isinstance(timeout, Compatibility.numeric):
+  if timeout is _DEFAULT_TIMEOUT:
+    timeout = _DEFAULT_TIMEOUT_SECS
+  elif isinstance(timeout, Compatibility.numeric):
     pass
   elif isinstance(timeout, Amount) and isinstance(timeout.unit(), Time):
     timeout = timeout.as_(Time.SECONDS)
   else:
     raise ValueError('timeout must be either numeric or Amount of Time.')
   q = Queue(maxsize=1)
-  class AnonymousThread(Thread):
-    def __init__(self):
-      super(AnonymousThread, self).__init__()
-      self.daemon = bool(daemon)
-    def run(self):
-      try:
-        result = closure()
-      except Exception as e:
-        if propagate:
-          result = e
-        else:
-          # conform to standard behaviour of an exception being raised inside a Thread
-          raise e
-      q.put(result)
-  AnonymousThread().start()
+  def run():
+    try:
+      result = closure()
+    except Exception as e:
+      if propagate:
+        result = e
+      else:
+        # conform to standard behaviour of an exception being raised inside a Thread, without
+        # taking down the pooled worker
+        sys.stderr.write('Exception in thread %s:\n' % threading.current_thread().name)
+        traceback.print_exc()
+        return
+    q.put(result)
+  _pool(daemon).submit(run)
   try:
     result = q.get(timeout=timeout)
   except Empty:
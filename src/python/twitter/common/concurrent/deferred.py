@@ -14,6 +14,9 @@
 # limitations under the License.
 # ==================================================================================================
 
+import heapq
+import itertools
+import threading
 import time
 
 from twitter.common.exceptions import ExceptionalThread
@@ -21,13 +24,18 @@ from twitter.common.lang import Compatibility
 from twitter.common.quantity import Amount, Time
 
 
+_NO_DELAY = Amount(0, Time.SECONDS)
+
+
 class Deferred(ExceptionalThread):
   """Wrapper for a delayed closure."""
 
-  def __init__(self, closure, delay=Amount(0, Time.SECONDS), clock=time):
+  def __init__(self, closure, delay=_NO_DELAY, clock=time):
     super(Deferred, self).__init__()
     self._closure = closure
-    if isinstance(delay, Compatibility.numeric):
+    if delay is _NO_DELAY:
+      self._delay = 0
+    elif isinstance(delay, Compatibility.numeric):
       self._delay = delay
     elif isinstance(delay, Amount) and isinstance(delay.unit(), Time):
       self._delay = delay.as_(Time.SECONDS)
@@ -37,21 +45,78 @@ class Deferred(ExceptionalThread):
     self._initialized = clock.time()
     self.daemon = True
 
+  def _start_due(self):
+    """Start the closure immediately: the scheduler has already waited out its delay."""
+    self._delay = 0
+    self.start()
+
   def run(self):
-    self._clock.sleep(self._delay)
+    if self._delay:
+      self._clock.sleep(self._delay)
     self._closure()
 
 
+class DeferScheduler(ExceptionalThread):
+  """Waits out the delays of all real-time deferrals from a single thread.
+
+  Each deferral is kept in a heap ordered by deadline and started on its own thread only once
+  it is due, so pending deferrals cost a heap entry rather than a sleeping thread each.
+  """
+
+  _INSTANCE = None
+  _INSTANCE_LOCK = threading.Lock()
+
+  @classmethod
+  def instance(cls):
+    with cls._INSTANCE_LOCK:
+      if cls._INSTANCE is None:
+        cls._INSTANCE = cls()
+        cls._INSTANCE.start()
+      return cls._INSTANCE
+
+  def __init__(self):
+    super(DeferScheduler, self).__init__(name='DeferScheduler')
+    self._condition = threading.Condition()
+    self._pending = []
+    self._sequence = itertools.count()
+    self.daemon = True
+
+  def schedule(self, deferred):
+    with self._condition:
+      # The sequence number keeps deferrals with equal deadlines in submission order.
+      heapq.heappush(self._pending,
+          (deferred._initialized + deferred._delay, next(self._sequence), deferred))
+      self._condition.notify()
+
+  def run(self):
+    while True:
+      with self._condition:
+        while True:
+          now = time.time()
+          if self._pending and self._pending[0][0] <= now:
+            _, _, deferred = heapq.heappop(self._pending)
+            break
+          self._condition.wait(self._pending[0][0] - now if self._pending else None)
+      deferred._start_due()
+
+
 def defer(closure, **kw):
   """Run a closure with a specified delay on its own thread.
 
+  With the default real-time clock, the delay is waited out by a shared scheduler thread and
+  the closure's thread is started once it is due; with any other clock the closure's thread
+  sleeps on that clock itself.
+
   :param closure: The callable to be deferred.
   :keyword delay: The delay in seconds or :class:`Amount` of :class:`Time`, default 0.
   :keyword clock: The clock interface to use for ``time`` and ``sleep``, default ``time`` module.
-  :returns: A deferred thread handle.
+  :returns: A deferred thread handle, started once the delay has elapsed.
   :rtype: :class:`Deferred`
   """
 
   deferred = Deferred(closure, **kw)
-  deferred.start()
+  if deferred._clock is time and deferred._delay > 0:
+    DeferScheduler.instance().schedule(deferred)
+  else:
+    deferred.start()
   return deferred
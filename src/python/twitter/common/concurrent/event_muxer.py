@@ -52,6 +52,7 @@ class EventMuxer(object):
     if not all(isinstance(arg, threading._Event) for arg in events):
       raise ValueError("arguments must be threading.Events()!")
     self._lock = threading.Lock()
+    self._events = events
     self._queue = Queue()
     self._wait_events = [self.WaitThread(event, self._queue) for event in events]
     self._started = False
@@ -67,6 +68,9 @@ class EventMuxer(object):
       - This function does not support re-entry after any previous wait() call has returned (due to
         timeout or dependent event being set). Instantiate new EventMuxers as needed.
 
+    No threads are spawned if one of the dependent events is already set, or if there is only a
+    single event to wait on.
+
     Note: in Python <2.7, threading.Event.wait(timeout) does not indicate on return whether or not
     the timeout was reached. In this scenario, EventMuxer.wait() will always return False.
 
@@ -78,10 +82,21 @@ class EventMuxer(object):
       if self._finished:
         raise RuntimeError("wait() does not support re-entry!")
       if not self._started:
-        for thread in self._wait_events:
-          thread.timeout = timeout
-          thread.start()
         self._started = True
+        for event in self._events:
+          if event.is_set():
+            self._finished = True
+            return bool(event.wait(0))
+        if len(self._events) != 1:
+          for thread in self._wait_events:
+            thread.timeout = timeout
+            thread.start()
+    if len(self._events) == 1:
+      try:
+        return bool(self._events[0].wait(timeout))
+      finally:
+        with self._lock:
+          self._finished = True
     try:
       if self._queue.get(timeout=timeout):
         return True
@@ -18,13 +18,17 @@
 
 import getpass
 import mimetypes
-import urllib
 
 from twitter.common import log
 
 from os.path import basename
 
 
+try:
+  from urllib import quote_plus
+except ImportError:
+  from urllib.parse import quote_plus
+
 try:
   from xmlrpclib import ServerProxy, Error as XMLRPCError, Binary
 except ImportError:
@@ -83,7 +87,7 @@ class Confluence(object):
   def get_url(server_url, wiki_space, page_title):
     """ return the url for a confluence page in a given space and with a given
     title. """
-    return '%s/display/%s/%s' % (server_url, wiki_space, urllib.quote_plus(page_title))
+    return '%s/display/%s/%s' % (server_url, wiki_space, quote_plus(page_title))
 
   def logout(self):
     """Terminates the session and connection to the server.
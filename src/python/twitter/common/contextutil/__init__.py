@@ -124,24 +124,50 @@ def temporary_file(root_dir=None, cleanup=True):
         safe_delete(fd.name)
 
 
+def _fsync(path):
+  fd = os.open(path, os.O_RDONLY)
+  try:
+    os.fsync(fd)
+  finally:
+    os.close(fd)
+
+
+def _fsync_parent(path):
+  """Make a rename into or creation in path's directory durable, where the platform allows it."""
+  if not hasattr(os, 'O_DIRECTORY'):
+    return
+  _fsync(os.path.dirname(os.path.abspath(path)))
+
+
 @contextmanager
-def safe_file(path, suffix=None, cleanup=True):
+def safe_file(path, suffix=None, cleanup=True, read_existing=True, durable=False):
   """A with-context that copies a file, and copies the copy back to the original file on success.
 
   This is useful for doing work on a file but only changing its state on success.
 
     - suffix: Use this suffix to create the copy. Otherwise use a random string.
     - cleanup: Whether or not to clean up the copy.
+    - read_existing: Whether to seed the copy with the original file's contents.  Callers that
+      rewrite the file from scratch can pass False to skip copying it.
+    - durable: Whether to fsync the new contents and their directory entry before returning, so
+      that the change survives a crash.
   """
-  safe_path = path + '.%s' % suffix or uuid.uuid4()
-  if os.path.exists(path):
+  safe_path = path + '.%s' % (suffix or uuid.uuid4().hex)
+  if read_existing and os.path.exists(path):
     shutil.copy(path, safe_path)
   try:
     yield safe_path
     if cleanup:
+      if durable:
+        _fsync(safe_path)
+      # The copy sits next to the original, so this is a rename rather than a copy.
       shutil.move(safe_path, path)
     else:
       shutil.copy(safe_path, path)
+      if durable:
+        _fsync(path)
+    if durable:
+      _fsync_parent(path)
   finally:
     if cleanup:
       safe_delete(safe_path)
@@ -164,20 +190,29 @@ def pushd(directory):
     os.chdir(cwd)
 
 
+_MUTABLE_SYS_ATTRIBUTES = (
+  'stdin', 'stdout', 'stderr',
+  'argv', 'path', 'path_importer_cache', 'path_hooks',
+  'modules', '__egginsert'
+)
+
+
 @contextmanager
 def mutable_sys():
   """
     A with-context that does backup/restore of sys.argv, sys.path and
     sys.stderr/stdout/stdin following execution.
   """
-  SAVED_ATTRIBUTES = [
-    'stdin', 'stdout', 'stderr',
-    'argv', 'path', 'path_importer_cache', 'path_hooks',
-    'modules', '__egginsert'
-  ]
-
-  _sys_backup = dict((key, getattr(sys, key)) for key in SAVED_ATTRIBUTES if hasattr(sys, key))
-  _sys_delete = set(filter(lambda key: not hasattr(sys, key), SAVED_ATTRIBUTES))
+  # Which attributes exist can change at runtime (e.g. setuptools sets __egginsert lazily), so
+  # probe on every entry, but only once per attribute.
+  sys_dict = sys.__dict__
+  _sys_backup = {}
+  _sys_delete = []
+  for key in _MUTABLE_SYS_ATTRIBUTES:
+    if key in sys_dict:
+      _sys_backup[key] = sys_dict[key]
+    else:
+      _sys_delete.append(key)
 
   try:
     yield sys
@@ -232,18 +267,24 @@ class Timer(object):
 
   def __init__(self, clock=time):
     self._clock = clock
+    # start and finish stay wall clock timestamps, but elapsed is measured on the monotonic clock
+    # where the clock provides one, so that wall clock adjustments do not skew it.
+    self._ticker = getattr(clock, 'monotonic', clock.time)
 
   def __enter__(self):
     self.start = self._clock.time()
     self.finish = None
+    self._start_tick = self._ticker()
+    self._finish_tick = None
     return self
 
   @property
   def elapsed(self):
-    if self.finish:
-      return self.finish - self.start
+    if self._finish_tick is not None:
+      return self._finish_tick - self._start_tick
     else:
-      return self._clock.time() - self.start
+      return self._ticker() - self._start_tick
 
   def __exit__(self, typ, val, traceback):
+    self._finish_tick = self._ticker()
     self.finish = self._clock.time()
@@ -14,9 +14,49 @@
 # limitations under the License.
 # ==================================================================================================
 
+import os
+import platform
 import threading
 from functools import wraps
 
+try:
+  import ctypes
+except ImportError:
+  ctypes = None
+
+
+_GETTID_SYSCALLS = {
+  'i386':    224,  # unistd_32.h: #define __NR_gettid 224
+  'x86_64':  186,  # unistd_64.h: #define __NR_gettid 186
+  'aarch64': 178,  # asm-generic/unistd.h: #define __NR_gettid 178
+  'armv7l':  224,  # arm unistd.h: #define __NR_gettid (__NR_SYSCALL_BASE+224)
+  'ppc64le': 207,  # powerpc unistd.h: #define __NR_gettid 207
+  's390x':   236,  # s390 unistd.h: #define __NR_gettid 236
+}
+
+
+def _resolve_gettid():
+  """Resolve a gettid() implementation once, or None if unsupported.
+
+  Python 3.8+ exposes os.gettid() directly; older interpreters fall back to issuing the system call
+  through libc's syscall() via ctypes.
+  """
+  if hasattr(os, 'gettid'):
+    return os.gettid
+  if ctypes is None or not platform.system().startswith('Linux'):
+    return None
+  syscall_nr = _GETTID_SYSCALLS.get(platform.machine())
+  if syscall_nr is None:
+    return None
+  try:
+    syscall = ctypes.CDLL('libc.so.6').syscall
+  except (OSError, AttributeError):
+    return None
+  return lambda: syscall(syscall_nr)
+
+
+_GETTID = _resolve_gettid()
+
 
 def __gettid():
   """Wrapper for the gettid() system call on Linux systems
@@ -35,19 +75,12 @@ def __gettid():
     -1 on any failure (bad platform, error accessing ctypes/libraries, actual system call failure)
 
   """
+  if _GETTID is None:
+    return -1
   try:
-    import platform
-    if not platform.system().startswith('Linux'):
-      raise ValueError
-    syscalls = {
-      'i386':   224,   # unistd_32.h: #define __NR_gettid 224
-      'x86_64': 186,   # unistd_64.h: #define __NR_gettid 186
-    }
-    import ctypes
-    tid = ctypes.CDLL('libc.so.6').syscall(syscalls[platform.machine()])
-  except:
-    tid = -1
-  return tid
+    return _GETTID()
+  except Exception:
+    return -1
 
 
 def identify_thread(instancemethod):
@@ -62,8 +95,9 @@ def identify_thread(instancemethod):
   to Python thread objects.
 
   The means for retrieving the thread ID is extremely nonportable - specifically, it will only work
-  on i386 and x86_64 Linux systems. However, including this decorator more generally should be safe
-  and not break any cross-platform code - it will just result in an 'UNKNOWN' thread ID.
+  on Linux, through os.gettid() on Python 3.8+ and otherwise only on the architectures listed in
+  _GETTID_SYSCALLS. However, including this decorator more generally should be safe and not break
+  any cross-platform code - it will just result in an 'UNKNOWN' thread ID.
 
   This decorator can be used to wrap any instance method (and technically also class methods). To be
   truly useful, though, it should be used to wrap the run() function of a class utilising the Python
@@ -49,7 +49,9 @@ def safe_mkdir_for(path, clean=False):
     Ensure that the parent directory for a file is present.  If it's not there, create it.
     If it is, no-op. If clean is True, ensure the directory is empty.
   """
-  safe_mkdir(os.path.dirname(path), clean)
+  directory = os.path.dirname(path)
+  if directory:
+    safe_mkdir(directory, clean)
 
 
 _MKDTEMP_CLEANER = None
@@ -101,8 +103,8 @@ def safe_rmtree(directory):
   """
     Delete a directory if it's present. If it's not present, no-op.
   """
-  if os.path.exists(directory):
-    shutil.rmtree(directory, True)
+  # With ignore_errors, rmtree already treats a missing directory as a no-op.
+  shutil.rmtree(directory, True)
 
 
 def safe_open(filename, *args, **kwargs):
@@ -110,7 +112,11 @@ def safe_open(filename, *args, **kwargs):
     Open a file safely (ensuring that the directory components leading up to it
     have been created first.)
   """
-  safe_mkdir(os.path.dirname(filename))
+  # A bare filename lives in the current directory, which needs no creating (and makedirs('')
+  # would fail).
+  directory = os.path.dirname(filename)
+  if directory:
+    safe_mkdir(directory)
   return open(filename, *args, **kwargs)
 
 
@@ -199,25 +205,63 @@ def safe_mtime(filename):
     return 0
 
 
-def du(directory):
+def _du_walk(directory):
   size = 0
   for root, _, files in os.walk(directory):
     size += sum(safe_bsize(os.path.join(root, filename)) for filename in files)
   return size
 
 
+def _du_scandir(directory):
+  # Same accounting as _du_walk, but the file types come from the directory listing and each
+  # entry is lstat'ed once, without a Python-level path join and function call per file.
+  size = 0
+  stack = [directory]
+  while stack:
+    try:
+      entries = os.scandir(stack.pop())
+    except OSError:
+      continue
+    for entry in entries:
+      # Like os.walk, symlinks to directories are neither counted nor followed.
+      if entry.is_dir():
+        if not entry.is_symlink():
+          stack.append(entry.path)
+        continue
+      try:
+        stat_result = entry.stat(follow_symlinks=False)
+        stat_mode = stat_result.st_mode
+        if stat.S_ISREG(stat_mode):
+          size += _calculate_bsize(stat_result)
+        elif stat.S_ISDIR(stat_mode):
+          size += stat_result.st_size
+        elif stat.S_ISLNK(stat_mode):
+          size += len(os.readlink(entry.path))
+      except OSError:
+        pass
+  return size
+
+
+def du(directory):
+  """
+    Return the disk usage of the files beneath directory, as summed by safe_bsize.
+  """
+  if hasattr(os, 'scandir'):
+    return _du_scandir(directory)
+  return _du_walk(directory)
+
+
+_MODE_MASK = 0o777
+_READ_BITS = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
 def chmod_plus_x(path):
   """
     Equivalent of unix `chmod a+x path`
   """
-  path_mode = os.stat(path).st_mode
-  path_mode &= int('777', 8)
-  if path_mode & stat.S_IRUSR:
-    path_mode |= stat.S_IXUSR
-  if path_mode & stat.S_IRGRP:
-    path_mode |= stat.S_IXGRP
-  if path_mode & stat.S_IROTH:
-    path_mode |= stat.S_IXOTH
+  path_mode = os.stat(path).st_mode & _MODE_MASK
+  # Each read bit sits two bits above the matching execute bit: grant x wherever r is granted.
+  path_mode |= (path_mode & _READ_BITS) >> 2
   os.chmod(path, path_mode)
 
 
@@ -225,8 +269,7 @@ def chmod_plus_w(path):
   """
     Equivalent of unix `chmod +w path`
   """
-  path_mode = os.stat(path).st_mode
-  path_mode &= int('777', 8)
+  path_mode = os.stat(path).st_mode & _MODE_MASK
   path_mode |= stat.S_IWRITE
   os.chmod(path, path_mode)
 
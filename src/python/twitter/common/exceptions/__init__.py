@@ -16,7 +16,7 @@
 
 from __future__ import print_function
 
-import inspect
+import linecache
 import sys
 import threading
 import traceback
@@ -59,32 +59,66 @@ class BasicExceptionHandler(object):
     Then raise away!
   """
 
+  # (filename, lineno, name, line) entries keyed by (code, f_lasti), so that repeated stack
+  # dumps do not go back through linecache for frames that have already been resolved.  The
+  # cache holds references to code objects, so it is bounded and simply reset when full.
+  _FRAME_CACHE = {}
+  _FRAME_CACHE_SIZE = 4096
+
+  # traceback.extract_stack reports frames without source as None on Python 2 and '' on 3.
+  _NO_SOURCE_LINE = None if Compatibility.PY2 else ''
+
+  @staticmethod
+  def extract_stack(frame):
+    """
+      Equivalent to traceback.extract_stack(frame), but memoizes each resolved frame.
+    """
+    cache = BasicExceptionHandler._FRAME_CACHE
+    entries = []
+    while frame is not None:
+      code = frame.f_code
+      key = (code, frame.f_lasti)
+      entry = cache.get(key)
+      if entry is None:
+        filename, lineno = code.co_filename, frame.f_lineno
+        linecache.checkcache(filename)
+        line = (linecache.getline(filename, lineno, frame.f_globals).strip() or
+                BasicExceptionHandler._NO_SOURCE_LINE)
+        if len(cache) >= BasicExceptionHandler._FRAME_CACHE_SIZE:
+          cache.clear()
+        entry = cache[key] = (filename, lineno, code.co_name, line)
+      entries.append(entry)
+      frame = frame.f_back
+    entries.reverse()
+    return entries
+
   @staticmethod
   def print_stack(thread_id, thread, stack, fh=sys.stderr, indent=0):
-    def print_indented(msg):
-      print('%s%s' % (' '*indent, msg), file=fh)
-    print_indented('Thread%s: %s (%s, %d)' % (
+    prefix = ' ' * indent
+    lines = ['%sThread%s: %s (%s, %d)\n' % (
+        prefix,
         ' (daemon)' if thread.daemon else '',
         thread.__class__.__name__,
         thread.name,
-        thread_id))
-    for filename, lineno, name, line in traceback.extract_stack(stack):
-      print_indented('  File: "%s", line %d, in %s' % (filename, lineno, name))
+        thread_id)]
+    for filename, lineno, name, line in BasicExceptionHandler.extract_stack(stack):
+      lines.append('%s  File: "%s", line %d, in %s\n' % (prefix, filename, lineno, name))
       if line:
-        print_indented('    %s' % line.strip())
-    print_indented('')
+        lines.append('%s    %s\n' % (prefix, line.strip()))
+    lines.append(prefix + '\n')
+    fh.write(''.join(lines))
 
   @staticmethod
   def synthesize_thread_stacks():
-    threads = dict([(th.ident, th) for th in threading.enumerate()])
     ostr = Compatibility.StringIO()
     # _current_frames not yet implemented on pypy and not guaranteed anywhere but
     # cpython in practice.
-    if hasattr(sys, '_current_frames') and (len(sys._current_frames()) > 1 or
-        sys._current_frames().values()[0] != inspect.currentframe()):
+    frames = sys._current_frames() if hasattr(sys, '_current_frames') else {}
+    if len(frames) > 1 or (frames and next(iter(frames.values())) is not sys._getframe()):
       # Multi-threaded
+      threads = dict((th.ident, th) for th in threading.enumerate())
       ostr.write('\nAll threads:\n')
-      for thread_id, stack in sys._current_frames().items():
+      for thread_id, stack in frames.items():
         BasicExceptionHandler.print_stack(thread_id, threads[thread_id], stack, ostr, indent=2)
     return ostr.getvalue()
 
@@ -16,8 +16,15 @@
 
 import copy
 import os
+import socket
 import threading
 import types
+from wsgiref.simple_server import make_server, WSGIRequestHandler, WSGIServer
+
+try:
+  from SocketServer import ThreadingMixIn
+except ImportError:
+  from socketserver import ThreadingMixIn
 
 import bottle
 
@@ -30,10 +37,45 @@ __all__ = (
     'response',
     'route',
     'static_file',
+    'ThreadedWSGIRefServer',
     'view',
 )
 
 
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+  daemon_threads = True
+  # SO_REUSEADDR lets a restarted process rebind the port without waiting out TIME_WAIT.
+  # SO_REUSEPORT is opt-in: it also lets an unrelated process bind the same port and have the
+  # kernel split connections between the two.
+  allow_reuse_address = True
+  allow_reuse_port = False
+
+  def server_bind(self):
+    if self.allow_reuse_port and hasattr(socket, 'SO_REUSEPORT'):
+      try:
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+      except (OSError, socket.error):
+        # Defined but unsupported by the running kernel.
+        pass
+    WSGIServer.server_bind(self)
+
+
+class ThreadedWSGIRefServer(bottle.ServerAdapter):
+  """
+    A bottle adapter for the stdlib wsgiref server that handles each request in its own
+    daemon thread, so that one slow client does not stall every other request.
+  """
+
+  def run(self, handler):
+    if self.quiet:
+      class QuietHandler(WSGIRequestHandler):
+        def log_request(*args, **kw): pass
+      self.options['handler_class'] = QuietHandler
+    server = make_server(self.host, self.port, handler, server_class=ThreadingWSGIServer,
+        **self.options)
+    server.serve_forever()
+
+
 class HttpServer(object):
   """
     Wrapper around bottle to make class-bound servers a little easier
@@ -118,6 +160,11 @@ class HttpServer(object):
           ...
   """
 
+  # Server adapters available to run() in addition to the ones built into bottle.
+  SERVER_ADAPTERS = {
+    'threaded_wsgiref': ThreadedWSGIRefServer,
+  }
+
   ROUTES_ATTRIBUTE = '__routes__'
   VIEW_ATTRIBUTE = '__view__'
   ERROR_ATTRIBUTE = '__errors__'
@@ -256,10 +303,12 @@ class HttpServer(object):
   def run(self, hostname, port, server='wsgiref'):
     """
       Start a webserver on hostname & port.
+
+      server may be any server understood by bottle, or one of SERVER_ADAPTERS.
     """
     self._hostname = hostname
     self._port = port
-    self._app.run(host=hostname, port=port, server=server)
+    self._app.run(host=hostname, port=port, server=self.SERVER_ADAPTERS.get(server, server))
 
   def __str__(self):
     return 'HttpServer(%s, mixins: %s)' % (
@@ -20,4 +20,4 @@ from .metrics import (
     CompoundMetrics,
     Observable,
     RootMetrics)
-from .sampler import MetricSampler
+from .sampler import LazyMetricSampler, MetricSampler
@@ -149,8 +149,10 @@ class Metrics(MetricRegistry, MetricProvider):
     return '.'.join([scope_name, sample_name])
 
   def sample(self):
-    samples = dict(filter(None, map(self.coerce_metric, self._metrics.items())))
-    for scope_name, scope in self._children.items():
+    # Registration takes no lock, so snapshot both dicts (list() of a dict is atomic under the
+    # GIL) rather than iterating live views that a concurrent register() could resize.
+    samples = dict(filter(None, map(self.coerce_metric, list(self._metrics.items()))))
+    for scope_name, scope in list(self._children.items()):
       samples.update((self.sample_name(scope_name, sample_name), sample_value)
                      for (sample_name, sample_value) in scope.sample().items())
     return samples
@@ -63,6 +63,7 @@ class MetricSampler(SamplerBase, MetricProvider):
   def __init__(self, provider, period=Amount(1, Time.SECONDS), clock=time):
     self._provider = provider
     self._last_sample = self._provider.sample()
+    self._epoch = 0
     self._lock = threading.Lock()
     SamplerBase.__init__(self, period, clock)
     self.daemon = True
@@ -71,10 +72,64 @@ class MetricSampler(SamplerBase, MetricProvider):
     with self._lock:
       return self._last_sample
 
+  def epoch(self):
+    """
+      A counter that advances every time a new sample is taken, so that consumers can cache
+      anything derived from sample() until it changes.
+    """
+    with self._lock:
+      return self._epoch
+
   def iterate(self):
     new_sample = self._provider.sample()
     with self._lock:
       self._last_sample = new_sample
+      self._epoch += 1
+
+
+class LazyMetricSampler(MetricProvider):
+  """
+    Samples from a MetricProvider on demand, at most once per period, instead of from a
+    background thread.  Concurrent readers of an expired sample wait for a single refresh.
+  """
+  def __init__(self, provider, period=Amount(1, Time.SECONDS), clock=time):
+    self._provider = provider
+    self._period = period.as_(Time.SECONDS)
+    self._clock = clock
+    self._last_sample = {}
+    self._last_sample_time = None
+    self._epoch = 0
+    self._lock = threading.Lock()
+
+  def _expired(self):
+    last_sample_time = self._last_sample_time
+    return last_sample_time is None or self._clock.time() - last_sample_time >= self._period
+
+  def _refresh(self):
+    if self._expired():
+      with self._lock:
+        if self._expired():
+          self.iterate()
+
+  def sample(self):
+    self._refresh()
+    return self._last_sample
+
+  def epoch(self):
+    """
+      A counter that advances every time a new sample is taken, so that consumers can cache
+      anything derived from sample() until it changes.
+    """
+    self._refresh()
+    return self._epoch
+
+  def iterate(self):
+    """
+      Take a new sample now, regardless of the age of the current one.
+    """
+    new_sample = self._provider.sample()
+    self._last_sample, self._epoch = new_sample, self._epoch + 1
+    self._last_sample_time = self._clock.time()
 
 
 class DiskMetricWriter(SamplerBase):
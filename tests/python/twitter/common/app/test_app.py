@@ -16,6 +16,7 @@
 
 from collections import defaultdict
 from functools import partial
+import os
 import threading
 import time
 import unittest
@@ -24,6 +25,8 @@ import sys
 from twitter.common import options
 from twitter.common.app import Module
 from twitter.common.app.application import Application
+from twitter.common.app.inspection import Inspection
+from twitter.common.contextutil import temporary_dir
 from twitter.common.exceptions import ExceptionalThread
 
 import pytest
@@ -114,6 +117,13 @@ class TestApp(unittest.TestCase):
     with pytest.raises(Module.DependencyCycle):
       self.factory.new_module('second', dependencies='first')
 
+  def test_app_cyclic_dependencies_transitive(self):
+    self.factory.new_module('first', dependencies='second')
+    self.factory.new_module('second', dependencies='third')
+    self.factory.new_module('fourth', dependencies=['first', 'third'])
+    with pytest.raises(Module.DependencyCycle):
+      self.factory.new_module('third', dependencies='fourth')
+
   def test_app_add_options_with_raw(self):
     # raw option
     app = Application(force_args=['--option1', 'option1value', 'extraargs'])
@@ -162,6 +172,49 @@ class TestApp(unittest.TestCase):
     app.add_command_options(test_command)
     assert hasattr(app.get_options(), option_name)
 
+  def test_app_register_module_option_defaults(self):
+    class OptionModule(Module):
+      OPTIONS = {
+        'foo': options.Option('--module_foo', default='foo', dest='module_foo'),
+        'bar': options.Option('--module_bar', dest='module_bar'),
+      }
+      def __init__(self):
+        Module.__init__(self, label='option_module')
+
+    app = Application(force_args=[])
+    app.set_option('module_foo', 'preset')
+    app.register_module(OptionModule())
+    assert app.get_options().module_foo == 'preset'
+    assert app.get_options().module_bar is None
+    app.configure(module='option_module', bar='configured')
+    assert app.get_options().module_bar == 'configured'
+
+  def test_app_rc_file_options(self):
+    with temporary_dir() as td:
+      rc_filename = os.path.join(td, 'testrc')
+      with open(rc_filename, 'w') as fp:
+        fp.write('[DEFAULT]\noptions = --option1 "from rc"\n')
+      app = Application(force_args=['extraargs'])
+      app._rc_filename = lambda: rc_filename
+      app.add_option('--option1', dest='option1')
+      app.init()
+      assert app.get_options().option1 == 'from rc'
+      assert app.argv() == ['extraargs']
+      assert app._add_default_options(['--option1', 'override']) == [
+          '--option1', 'from rc', '--option1', 'override']
+
+  def test_app_rc_file_malformed_unrelated_section(self):
+    with temporary_dir() as td:
+      rc_filename = os.path.join(td, 'testrc')
+      with open(rc_filename, 'w') as fp:
+        fp.write('[DEFAULT]\noptions = --option1 "from rc"\n')
+        fp.write('[other]\noptions = --option1 "unterminated\n')
+      app = Application(force_args=[])
+      app._rc_filename = lambda: rc_filename
+      app.add_option('--option1', dest='option1')
+      app.init()
+      assert app.get_options().option1 == 'from rc'
+
 
 class TestApplication(Application):
   def __init__(self, main_method, force_args=[]):
@@ -439,3 +492,46 @@ def test_application_help():
   assert(not app._usage == help_msg)
   app.set_usage_based_on_commands(sort=True)
   assert(app._usage == help_msg)
+
+
+def test_set_string_margin():
+  assert Application._set_string_margin('', 2, 4) == ''
+  assert Application._set_string_margin('  one line  ', 2, 4) == '  one line'
+  assert Application._set_string_margin("""
+      first
+        second
+      third
+  """, 0, 4) == 'first\n    second\n    third'
+
+
+def test_rewrite_help_is_idempotent():
+  op = options.Option('--foo', dest='foo', default=23, help='Foo, default %default.')
+  Application.rewrite_help(op)
+  Application.rewrite_help(op)
+  assert op.help == 'Foo, default 23.'
+  op = options.Option('--bar', dest='bar', default='baz', help='Bar.')
+  Application.rewrite_help(op)
+  Application.rewrite_help(op)
+  assert op.help == 'Bar. [default: baz]'
+
+
+def test_find_main_from_closure():
+  def make_lookup():
+    def main():
+      pass
+    def lookup():
+      main  # Closes over main, so it is a free variable of this frame.
+      return Inspection.find_main_from_caller()
+    return main, lookup
+
+  main = 'not the closure main'
+  closure_main, lookup = make_lookup()
+  assert lookup() is closure_main
+
+
+def test_debug_follows_option_values():
+  app = Application(force_args=[])
+  app.init()
+  assert not app._debug
+  app.get_options().twitter_common_app_debug = True
+  assert app._debug
@@ -14,12 +14,18 @@
 # limitations under the License.
 # ==================================================================================================
 
+import threading
 import unittest
 
-from twitter.common.app.modules.varz import VarsEndpoint, VarsSubsystem
-from twitter.common.http.server import request
+from twitter.common.app.modules.varz import (
+    EndpointTracePlugin,
+    StatusStats,
+    VarsEndpoint,
+    VarsSubsystem,
+)
+from twitter.common.http.server import request, response
 from twitter.common.quantity import Amount, Time
-from twitter.common.metrics import NamedGauge, RootMetrics
+from twitter.common.metrics import MutatorGauge, NamedGauge, RootMetrics
 
 import json
 import pytest
@@ -46,7 +52,7 @@ class TestVarz(unittest.TestCase):
     regex = vars_subsystem.compile_stats_filters(["alpha", "beta.*"])
     endpoint = VarsEndpoint(period=Amount(60000, Time.MILLISECONDS), stats_filter=regex)
     request.GET.append('filtered', '1')
-    metrics_returned = endpoint.handle_vars_json()
+    metrics_returned = json.loads(endpoint.handle_vars_json())
     assert "zone" in metrics_returned
     assert "alpha" not in metrics_returned
     request.GET.replace('filtered', None)
@@ -62,7 +68,7 @@ class TestVarz(unittest.TestCase):
     vars_subsystem = VarsSubsystem()
     regex = vars_subsystem.compile_stats_filters(["alpha", "beta.*"])
     endpoint = VarsEndpoint(period=Amount(60000, Time.MILLISECONDS), stats_filter=regex)
-    metrics_returned = endpoint.handle_vars_json()
+    metrics_returned = json.loads(endpoint.handle_vars_json())
     assert "zone" in metrics_returned
     assert "alpha" in metrics_returned
     request.GET.replace('filtered', None)
@@ -79,7 +85,141 @@ class TestVarz(unittest.TestCase):
     regex = None
     endpoint = VarsEndpoint(period=Amount(60000, Time.MILLISECONDS), stats_filter=regex)
     request.GET.append('filtered', '1')
-    metrics_returned = endpoint.handle_vars_json()
+    metrics_returned = json.loads(endpoint.handle_vars_json())
     assert "zone" in metrics_returned
     assert "alpha" in metrics_returned
-    request.GET.replace('filtered', None)
\ No newline at end of file
+    request.GET.replace('filtered', None)
+
+  def test_vars_rendered_once_per_sample(self):
+    rm = RootMetrics()
+    gauge = MutatorGauge('varz_render_cache', 'before')
+    rm.register(gauge)
+
+    endpoint = VarsEndpoint(period=Amount(60000, Time.MILLISECONDS))
+    endpoint._monitor.iterate()
+    body = endpoint.handle_vars()
+    assert 'varz_render_cache before' in body.split('\n')
+
+    # Until the sampler takes a new sample the same rendered body is served.
+    gauge.write('after')
+    assert endpoint.handle_vars() is body
+
+    endpoint._monitor.iterate()
+    assert 'varz_render_cache after' in endpoint.handle_vars().split('\n')
+
+  def test_vars_sorted_and_filtered(self):
+    rm = RootMetrics()
+    rm.register(NamedGauge('varz_sorted_b', 2))
+    rm.register(NamedGauge('varz_sorted_a', 1))
+    regex = VarsSubsystem().compile_stats_filters(['varz_sorted_b'])
+    endpoint = VarsEndpoint(period=Amount(60000, Time.MILLISECONDS), stats_filter=regex)
+    endpoint._monitor.iterate()
+
+    lines = endpoint.handle_vars().split('\n')
+    assert lines == sorted(lines)
+    assert lines.index('varz_sorted_a 1') + 1 == lines.index('varz_sorted_b 2')
+
+    request.GET.append('filtered', '1')
+    try:
+      filtered_lines = endpoint.handle_vars().split('\n')
+    finally:
+      request.GET.replace('filtered', None)
+    assert 'varz_sorted_a 1' in filtered_lines
+    assert 'varz_sorted_b 2' not in filtered_lines
+
+    # A newly exported name invalidates the cached key order.
+    rm.register(NamedGauge('varz_sorted_ab', 3))
+    endpoint._monitor.iterate()
+    lines = endpoint.handle_vars().split('\n')
+    assert lines.index('varz_sorted_ab 3') == lines.index('varz_sorted_a 1') + 1
+
+  def test_vars_json_encoded_once_per_sample(self):
+    rm = RootMetrics()
+    gauge = MutatorGauge('varz_json_cache', 1)
+    rm.register(gauge)
+
+    endpoint = VarsEndpoint(period=Amount(60000, Time.MILLISECONDS))
+    endpoint._monitor.iterate()
+    body = endpoint.handle_vars_json()
+    assert isinstance(body, bytes)
+    assert b'": ' not in body and b', "' not in body
+    assert json.loads(body)['varz_json_cache'] == 1
+
+    gauge.write(2)
+    assert endpoint.handle_vars_json() is body
+
+    endpoint._monitor.iterate()
+    assert json.loads(endpoint.handle_vars_json())['varz_json_cache'] == 2
+
+  def test_endpoint_trace_plugin_buckets_by_status(self):
+    plugin = EndpointTracePlugin()
+    plugin.setup(None)
+    callback = plugin.apply(lambda: 'body', None)
+    response.status = 404
+    try:
+      assert callback() == 'body'
+    finally:
+      response.status = 200
+    sample = plugin.metrics.sample()
+    assert sample['4xx.count'] == 1
+    assert sample['4xx.total_ns'] >= 0
+    assert sample['2xx.count'] == 0
+
+  def test_status_stats_sums_shards(self):
+    stats = StatusStats()
+    stats.increment(5)
+    thread = threading.Thread(target=stats.increment, args=(7,))
+    thread.start()
+    thread.join()
+    sample = stats.metrics.sample()
+    assert sample['count'] == 2
+    assert sample['total_ns'] == 12
+
+  def test_vars_conditional_get(self):
+    endpoint = VarsEndpoint(period=Amount(60000, Time.MILLISECONDS))
+    endpoint.handle_vars()
+    etag = response.get_header('ETag')
+    assert etag
+
+    request.environ['HTTP_IF_NONE_MATCH'] = etag
+    try:
+      assert endpoint.handle_vars() == ''
+      assert response.status_code == 304
+
+      # A new sample gets a new tag, so the body is served again.
+      response.status = 200
+      endpoint._monitor.iterate()
+      assert endpoint.handle_vars() != ''
+      assert response.status_code == 200
+      assert response.get_header('ETag') != etag
+    finally:
+      del request.environ['HTTP_IF_NONE_MATCH']
+      response.status = 200
+
+  def test_vars_body_is_latin1_bytes(self):
+    RootMetrics().register(NamedGauge('varz_latin1', u'caf\xe9'))
+    endpoint = VarsEndpoint(period=Amount(60000, Time.MILLISECONDS))
+    body = endpoint.handle_vars()
+    assert isinstance(body, bytes)
+    assert b'varz_latin1 caf\xe9' in body.split(b'\n')
+
+  def test_vars_lines_follow_value_changes(self):
+    rm = RootMetrics()
+    gauge = MutatorGauge('varz_lines', 1)
+    rm.register(gauge)
+    endpoint = VarsEndpoint(period=Amount(60000, Time.MILLISECONDS))
+
+    def render(value):
+      gauge.write(value)
+      endpoint._monitor.iterate()
+      return [line for line in endpoint.handle_vars().split(b'\n')
+              if line.startswith(b'varz_lines ')]
+
+    assert render(1) == [b'varz_lines 1']
+    assert render(1.0) == [b'varz_lines 1.0']
+    assert render(True) == [b'varz_lines True']
+    values = [1]
+    assert render(values) == [b'varz_lines [1]']
+    values.append(2)
+    endpoint._monitor.iterate()
+    assert b'varz_lines [1, 2]' in endpoint.handle_vars().split(b'\n')
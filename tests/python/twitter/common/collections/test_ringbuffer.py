@@ -49,3 +49,21 @@ def test_bad_operations():
   r.append(1)
   with pytest.raises(RingBuffer.InvalidOperation):
     del r[0]
+
+def test_iteration_order():
+  r = RingBuffer(3)
+  assert list(r) == r.tolist() == []
+  r.append(1)
+  r.append(2)
+  assert list(r) == r.tolist() == [1, 2]
+  for i in xrange(3, 8):
+    r.append(i)
+    assert list(r) == r.tolist() == [i - 2, i - 1, i]
+  assert str(r) == '[5, 6, 7]'
+
+def test_zero_stays_bounded():
+  r = RingBuffer(3)
+  for i in xrange(0, 100):
+    r.append(i)
+    assert 0 <= r._zero < 3
+  assert (r[0], r[1], r[2], r[-1]) == (97, 98, 99, 99)
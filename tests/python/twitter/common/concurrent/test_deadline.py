@@ -1,4 +1,5 @@
 import time
+import threading
 from functools import partial
 
 import pytest
@@ -18,3 +19,28 @@ def test_deadline_custom_timeout():
 
 def test_deadline_no_timeout():
   assert 'success' == deadline(lambda: 'success')
+
+
+def test_deadline_reuses_threads():
+  ident = lambda: threading.current_thread().ident
+  first = deadline(ident, timeout=1.0)
+  assert first == deadline(ident, timeout=1.0)
+
+
+def test_deadline_not_blocked_by_timed_out_closure():
+  release = threading.Event()
+  with pytest.raises(Timeout):
+    deadline(release.wait, timeout=0.05)
+  try:
+    assert 'success' == deadline(lambda: 'success', timeout=1.0)
+  finally:
+    release.set()
+
+
+def test_deadline_propagate():
+  def boom():
+    raise ValueError('boom')
+  with pytest.raises(ValueError):
+    deadline(boom, timeout=1.0, propagate=True)
+  with pytest.raises(Timeout):
+    deadline(boom, timeout=0.1)
@@ -3,6 +3,8 @@ try:
 except ImportError:
   from queue import Empty, Queue
 
+import threading
+
 from twitter.common.concurrent import defer
 from twitter.common.contextutil import Timer
 from twitter.common.testing.clock import ThreadedClock
@@ -29,3 +31,20 @@ def test_defer():
     assert results.get() == 'success'
 
   assert timer.elapsed == DELAY + 1
+
+
+def test_defer_real_clock_order():
+  results = Queue()
+  for delay in (0.2, 0.1, 0):
+    defer(lambda delay=delay: results.put(delay), delay=delay)
+  assert [results.get(timeout=5) for _ in range(3)] == [0, 0.1, 0.2]
+
+
+def test_defer_real_clock_does_not_block_on_closures():
+  release, results = threading.Event(), Queue()
+  defer(release.wait, delay=0.01)
+  defer(lambda: results.put('second'), delay=0.02)
+  try:
+    assert results.get(timeout=5) == 'second'
+  finally:
+    release.set()
@@ -1,4 +1,5 @@
-from threading import Event
+import threading
+from threading import Event, Timer
 
 from twitter.common.concurrent import EventMuxer
 
@@ -31,3 +32,21 @@ def test_wait_with_return_values():
   e1, e2 = Event(), Event()
   e1.set()
   assert EventMuxer(e1, e2).wait()
+
+
+@pytest.mark.skipif("sys.version_info < (2, 7)")
+def test_wait_woken_by_set():
+  e1, e2 = Event(), Event()
+  muxer = EventMuxer(e1, e2)
+  Timer(0.05, e2.set).start()
+  assert muxer.wait(timeout=5)
+  assert e2.is_set()
+
+
+def test_wait_without_threads():
+  before = threading.active_count()
+  e1, e2 = Event(), Event()
+  e2.set()
+  EventMuxer(e1, e2).wait(timeout=5)
+  assert not EventMuxer(Event()).wait(timeout=0.01)
+  assert threading.active_count() == before
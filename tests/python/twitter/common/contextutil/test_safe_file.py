@@ -0,0 +1,77 @@
+# ==================================================================================================
+# Copyright 2014 Twitter, Inc.
+# --------------------------------------------------------------------------------------------------
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this work except in compliance with the License.
+# You may obtain a copy of the License in the LICENSE file, or at:
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==================================================================================================
+
+import os
+
+from twitter.common.contextutil import safe_file, temporary_dir
+
+import pytest
+
+
+def read(path):
+  with open(path) as fp:
+    return fp.read()
+
+
+def write(path, content):
+  with open(path, 'w') as fp:
+    fp.write(content)
+
+
+def test_safe_file_commits_on_success():
+  with temporary_dir() as td:
+    path = os.path.join(td, 'file')
+    write(path, 'old')
+    with safe_file(path) as safe_path:
+      assert safe_path != path
+      assert not safe_path.endswith('.None')
+      assert read(safe_path) == 'old'
+      write(safe_path, 'new')
+      assert read(path) == 'old'
+    assert read(path) == 'new'
+    assert os.listdir(td) == ['file']
+
+
+def test_safe_file_untouched_on_failure():
+  with temporary_dir() as td:
+    path = os.path.join(td, 'file')
+    write(path, 'old')
+    with pytest.raises(ValueError):
+      with safe_file(path, suffix='tmp') as safe_path:
+        assert safe_path == path + '.tmp'
+        write(safe_path, 'new')
+        raise ValueError()
+    assert read(path) == 'old'
+    assert os.listdir(td) == ['file']
+
+
+def test_safe_file_without_read_existing():
+  with temporary_dir() as td:
+    path = os.path.join(td, 'file')
+    write(path, 'old')
+    with safe_file(path, read_existing=False) as safe_path:
+      assert not os.path.exists(safe_path)
+      write(safe_path, 'new')
+    assert read(path) == 'new'
+
+
+@pytest.mark.parametrize('cleanup', (True, False))
+def test_safe_file_durable(cleanup):
+  with temporary_dir() as td:
+    path = os.path.join(td, 'file')
+    with safe_file(path, cleanup=cleanup, durable=True) as safe_path:
+      write(safe_path, 'new')
+    assert read(path) == 'new'
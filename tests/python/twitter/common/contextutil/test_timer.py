@@ -30,3 +30,21 @@ def test_timer():
   assert t.elapsed > 0.2
   assert t.finish < time.time()
 
+
+
+class FakeClock(object):
+  def __init__(self):
+    self.now = 0
+
+  def time(self):
+    return self.now
+
+
+def test_timer_with_clock():
+  clock = FakeClock()
+  with Timer(clock=clock) as t:
+    clock.now = 2
+    assert t.elapsed == 2
+  clock.now = 5
+  assert t.finish == 2
+  assert t.elapsed == 2
@@ -14,6 +14,7 @@
 # limitations under the License.
 # ==================================================================================================
 
+import os
 import platform
 import pytest
 import threading
@@ -25,9 +26,14 @@ from twitter.common.decorators.threads import identify_thread
 SUPPORTED_PLATFORMS = (
   ('Linux', 'i386'),
   ('Linux', 'x86_64'),
+  ('Linux', 'aarch64'),
+  ('Linux', 'armv7l'),
+  ('Linux', 'ppc64le'),
+  ('Linux', 's390x'),
 )
 
-PLATFORM_SUPPORTED = (platform.system(), platform.machine()) in SUPPORTED_PLATFORMS
+PLATFORM_SUPPORTED = (hasattr(os, 'gettid') or
+                      (platform.system(), platform.machine()) in SUPPORTED_PLATFORMS)
 
 
 class TestThread(threading.Thread):
@@ -59,6 +65,15 @@ def test_gettid_supported_platform():
   assert __gettid() != -1
 
 
+@pytest.mark.skipif("not PLATFORM_SUPPORTED")
+def test_gettid_per_thread():
+  tids = []
+  thread = threading.Thread(target=lambda: tids.append(__gettid()))
+  thread.start()
+  thread.join()
+  assert tids[0] not in (-1, __gettid())
+
+
 @pytest.mark.skipif("not PLATFORM_SUPPORTED")
 def test_identified_thread_supported_platform():
   thread = TestThread()
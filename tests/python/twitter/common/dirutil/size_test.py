@@ -18,6 +18,7 @@ import os
 import stat
 
 from twitter.common.contextutil import temporary_file, temporary_dir
+from twitter.common import dirutil
 from twitter.common.dirutil import safe_size, safe_bsize, du
 
 
@@ -57,3 +58,19 @@ def test_size():
   safe_size(os.path.join(td, 'file3.txt'), on_error=on_error)
   assert errors == [os.path.join(td, 'file3.txt')]
 
+
+
+def test_du_nested():
+  with temporary_dir() as td:
+    os.makedirs(os.path.join(td, 'a', 'b'))
+    create_files(td, 'top.txt')
+    for path in ('top.txt', os.path.join('a', 'b', 'deep.txt')):
+      with open(os.path.join(td, path), 'w') as fp:
+        fp.write('!' * 4096)
+    # symlinks to directories are not followed
+    os.symlink('a', os.path.join(td, 'link_to_a'))
+    expected = (safe_bsize(os.path.join(td, 'top.txt')) +
+                safe_bsize(os.path.join(td, 'a', 'b', 'deep.txt')))
+    assert du(td) == expected
+    assert dirutil._du_walk(td) == expected
+    assert du(os.path.join(td, 'does_not_exist')) == 0
@@ -1,8 +1,10 @@
 import atexit
 import os
+import stat
 import tempfile
 
 from twitter.common import dirutil
+from twitter.common.contextutil import pushd, temporary_dir, temporary_file
 
 import mox
 import pytest
@@ -45,3 +47,31 @@ def test_mkdtemp_setup_teardown():
 
     m.UnsetStubs()
     m.VerifyAll()
+
+
+def test_chmod_plus_x():
+  with temporary_file() as fp:
+    for mode, expected in ((0o400, 0o500), (0o640, 0o750), (0o644, 0o755), (0o200, 0o200)):
+      os.chmod(fp.name, mode)
+      dirutil.chmod_plus_x(fp.name)
+      assert stat.S_IMODE(os.stat(fp.name).st_mode) == expected
+
+
+def test_chmod_plus_w():
+  with temporary_file() as fp:
+    os.chmod(fp.name, 0o444)
+    dirutil.chmod_plus_w(fp.name)
+    assert stat.S_IMODE(os.stat(fp.name).st_mode) == 0o644
+
+
+def test_safe_open():
+  with temporary_dir() as td:
+    with dirutil.safe_open(os.path.join(td, 'a', 'b', 'file'), 'w') as fp:
+      fp.write('nested')
+    with pushd(td):
+      with dirutil.safe_open('file', 'w') as fp:
+        fp.write('bare')
+      dirutil.touch('touched')
+    assert os.path.isfile(os.path.join(td, 'a', 'b', 'file'))
+    assert os.path.isfile(os.path.join(td, 'file'))
+    assert os.path.isfile(os.path.join(td, 'touched'))
@@ -76,3 +76,44 @@ def test_exception_swallowed():
     thread.join()
     assert queue.empty()
   assert sys.excepthook == sys.__excepthook__
+
+
+def test_extract_stack():
+  import traceback
+  from twitter.common.exceptions import BasicExceptionHandler
+  def extract_both():
+    frame = sys._getframe(1)
+    return ([tuple(entry) for entry in traceback.extract_stack(frame)],
+            BasicExceptionHandler.extract_stack(frame))
+  for _ in range(2):  # The second extraction is served from the frame cache.
+    expected, extracted = extract_both()
+    assert extracted == expected
+
+
+def test_extract_stack_cache_is_bounded():
+  from twitter.common.exceptions import BasicExceptionHandler
+  size = BasicExceptionHandler._FRAME_CACHE_SIZE
+  BasicExceptionHandler._FRAME_CACHE_SIZE = 2
+  try:
+    BasicExceptionHandler.extract_stack(sys._getframe())
+    assert len(BasicExceptionHandler._FRAME_CACHE) <= 2
+  finally:
+    BasicExceptionHandler._FRAME_CACHE_SIZE = size
+
+
+def test_synthesize_thread_stacks():
+  from twitter.common.exceptions import BasicExceptionHandler
+  started, finish = threading.Event(), threading.Event()
+  def waiter():
+    started.set()
+    finish.wait()
+  thread = threading.Thread(target=waiter, name='waiter')
+  thread.start()
+  started.wait()
+  try:
+    stacks = BasicExceptionHandler.synthesize_thread_stacks()
+  finally:
+    finish.set()
+    thread.join()
+  assert 'All threads:' in stacks
+  assert '(waiter,' in stacks
@@ -15,8 +15,16 @@
 # ==================================================================================================
 
 import functools
+import socket
+import threading
+import time
 import wsgiref.util
 
+try:
+  from urllib2 import urlopen
+except ImportError:
+  from urllib.request import urlopen
+
 from twitter.common.http import HttpServer
 
 import pytest
@@ -112,3 +120,78 @@ def test_bind_method():
   bs._bind_method(BaseServerIsSubclass(), 'method_two')
   assert bs.method_one() == 'method_one'
   assert bs.method_two() == 'method_two'
+
+
+def wait_for_port(port, timeout=10):
+  deadline = time.time() + timeout
+  while time.time() < deadline:
+    try:
+      socket.create_connection(('localhost', port)).close()
+      return
+    except socket.error:
+      time.sleep(0.05)
+  raise AssertionError('Server never came up on port %d' % port)
+
+
+def unused_port():
+  sock = socket.socket()
+  sock.bind(('localhost', 0))
+  port = sock.getsockname()[1]
+  sock.close()
+  return port
+
+
+@skipifpy3k
+def test_threaded_wsgiref_server():
+  release = threading.Event()
+
+  class SlowServer(HttpServer):
+    @HttpServer.route('/slow')
+    def slow(self):
+      release.wait(10)
+      return 'slow'
+
+    @HttpServer.route('/fast')
+    def fast(self):
+      return 'fast'
+
+  server, port = SlowServer(), unused_port()
+  server_thread = threading.Thread(target=server.run, args=('localhost', port, 'threaded_wsgiref'))
+  server_thread.daemon = True
+  server_thread.start()
+  wait_for_port(port)
+
+  url = 'http://localhost:%d' % port
+  slow_thread = threading.Thread(target=lambda: urlopen(url + '/slow', timeout=10).read())
+  slow_thread.start()
+  try:
+    # A request that is blocked in its handler must not hold up the next one.
+    assert urlopen(url + '/fast', timeout=5).read() == b'fast'
+  finally:
+    release.set()
+    slow_thread.join()
+
+
+def test_threading_wsgi_server_reuse_options():
+  from twitter.common.http.server import ThreadingWSGIServer
+  from wsgiref.simple_server import WSGIRequestHandler
+
+  server = ThreadingWSGIServer(('localhost', 0), WSGIRequestHandler)
+  try:
+    assert server.socket.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR)
+    if hasattr(socket, 'SO_REUSEPORT'):
+      assert not server.socket.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT)
+  finally:
+    server.server_close()
+
+  if not hasattr(socket, 'SO_REUSEPORT'):
+    return
+
+  class ReusePortServer(ThreadingWSGIServer):
+    allow_reuse_port = True
+
+  server = ReusePortServer(('localhost', 0), WSGIRequestHandler)
+  try:
+    assert server.socket.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT)
+  finally:
+    server.server_close()
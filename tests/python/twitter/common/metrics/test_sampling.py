@@ -21,6 +21,7 @@ from twitter.common.contextutil import temporary_file
 from twitter.common.metrics import Label
 from twitter.common.metrics.metrics import Metrics
 from twitter.common.metrics.sampler import (
+    LazyMetricSampler,
     MetricSampler,
     SamplerBase,
     DiskMetricWriter,
@@ -101,3 +102,37 @@ def test_metric_sample():
   assert sampler.sample() == {}
   sampler.iterate()
   assert sampler.sample() == {'herp': 'derp'}
+
+
+def test_metric_sampler_epoch():
+  metrics = Metrics()
+  sampler = MetricSampler(metrics)
+  assert sampler.epoch() == 0
+  sampler.iterate()
+  assert sampler.epoch() == 1
+  sampler.iterate()
+  assert sampler.epoch() == 2
+
+
+def test_lazy_metric_sampler():
+  class FakeClock(object):
+    def __init__(self):
+      self.now = 0
+    def time(self):
+      return self.now
+
+  clock = FakeClock()
+  metrics = Metrics()
+  sampler = LazyMetricSampler(metrics, period=Amount(1, Time.SECONDS), clock=clock)
+  metrics.register(Label('herp', 'derp'))
+  assert sampler.sample() == {'herp': 'derp'}
+  assert sampler.epoch() == 1
+
+  metrics.register(Label('derp', 'herp'))
+  clock.now = 0.5
+  assert sampler.sample() == {'herp': 'derp'}
+  assert sampler.epoch() == 1
+
+  clock.now = 1
+  assert sampler.sample() == {'herp': 'derp', 'derp': 'herp'}
+  assert sampler.epoch() == 2